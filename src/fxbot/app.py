@@ -40,7 +40,7 @@ def _run_cli(settings, log) -> None:
     """CLIモード — MT5接続→ペア検出→OHLCV取得."""
     from fxbot.mt5.connection import connect, disconnect, get_account_info
     from fxbot.mt5.symbols import detect_symbols, save_symbols
-    from fxbot.mt5.data_feed import fetch_multi_timeframe
+    from fxbot.mt5.data_feed import fetch_multi_symbol
 
     log.info("=== FXBot3 CLI モード ===")
 
@@ -63,9 +63,9 @@ def _run_cli(settings, log) -> None:
             return
 
         demo_symbols = symbol_names[:3]
-        for sym in demo_symbols:
+        all_data = fetch_multi_symbol(demo_symbols, settings)
+        for sym, data in all_data.items():
             log.info(f"--- {sym} データ取得 ---")
-            data = fetch_multi_timeframe(sym, settings)
             for tf, df in data.items():
                 log.info(f"  {tf}: {len(df)}行, 期間: {df.index[0]} ~ {df.index[-1]}")
 
@@ -252,6 +252,12 @@ class BacktestEngine:
         point_size = self._resolve_point_size(feature_matrix, symbol=symbol, point=point, pip_size=pip_size)
         point_for_signal = point if point is not None else pip_size
 
+        # 予測値が閾値未満のバーは generate_signal が必ず HOLD を返すため、
+        # 全バー分を一括判定して呼び出し自体を省く（NaN は従来どおり判定に回す）
+        pred_values = predictions.to_numpy(dtype=np.float64)
+        threshold = self.settings.trading.min_prediction_threshold
+        signal_bars = ~(np.abs(pred_values) < threshold)
+
         for i in range(len(feature_matrix)):
             row = feature_matrix.iloc[i]
             time = feature_matrix.index[i]
@@ -381,8 +387,8 @@ class BacktestEngine:
                 positions.pop(idx)
 
             # --- エントリーシグナル ---
-            if i < len(predictions) and len(positions) < self.max_positions:
-                pred = predictions.iloc[i] if i < len(predictions) else 0.0
+            if i < len(pred_values) and signal_bars[i] and len(positions) < self.max_positions:
+                pred = pred_values[i]
                 regime = self._resolve_regime(row)
                 h4_regime = self._resolve_h4_regime(row)
                 current_hour_utc = getattr(time, "hour", None)
@@ -171,7 +171,8 @@ def run_wfo(
         )
 
         # 3. 選択された特徴量で再学習
-        X_train_sel, y_train_sel, _ = prepare_dataset(train_data, horizon, selected, mode=model_mode)
+        #    （ラベル再計算を避け、全特徴量データセットから列だけ切り出す）
+        X_train_sel, y_train_sel = X_train.loc[:, selected], y_train
         model, train_metrics = train_model(X_train_sel, y_train_sel, settings, mode=model_mode)
 
         # 4. テスト期間で予測
@@ -40,6 +40,7 @@ class TradingConfig:
     max_lot_balance_pct: float = 0.0     # 0.0=無効, >0で残高連動（例: 0.005=残高の0.5%）
     min_lot: float = 0.01
     min_confidence: float = 0.0  # 分類モデルの最低信頼度（0.0=無効）
+    kelly_multiplier: float = 0.5  # ケリー比率に掛ける係数（0.5=ハーフケリー）
     active_symbols: list[str] = field(default_factory=list)  # 最大3ペア
 
 
@@ -71,6 +72,7 @@ class ModelConfig:
     num_boost_round: int = 1000
     early_stopping_rounds: int = 50
     shap_top_pct: float = 0.3
+    min_train_rows: int = 500  # 特徴量行数がこれ未満なら学習を中止
     model_dir: str = "data/models"
     mode: str = "regression"  # "regression" | "classification"
 
@@ -30,6 +30,11 @@ from fxbot.logger import get_logger
 log = get_logger(__name__)
 
 
+def _dirty_matches(dirty: set[str] | None, *prefixes: str) -> bool:
+    """変更キー集合が指定プレフィックスのいずれかに該当するか（None は全変更扱い）."""
+    return dirty is None or any(k.startswith(prefixes) for k in dirty)
+
+
 class MainWindow(QMainWindow):
     """FXBot3 メインウィンドウ."""
 
@@ -269,8 +274,10 @@ class MainWindow(QMainWindow):
         except Exception:
             log.exception("シンボル読み込みエラー")
 
-    def _on_symbols_changed(self) -> None:
+    def _on_symbols_changed(self, dirty: set[str] | None = None) -> None:
         """active_symbols 変更時に各タブを更新."""
+        if not _dirty_matches(dirty, "trading.active_symbols"):
+            return
         syms = self.settings.trading.active_symbols
         self.batch_train_tab.refresh_symbols(syms)
         self.market_filter_tab.refresh_symbols(syms)
@@ -462,11 +469,17 @@ class MainWindow(QMainWindow):
 
     # --- 口座切替・その他 ---
 
-    def _on_settings_changed(self):
-        """設定保存後に SlackNotifier を再初期化."""
+    def _on_settings_changed(self, dirty: set[str] | None = None):
+        """設定保存後に変更箇所に応じて SlackNotifier 再初期化・プロファイル一覧更新を行う."""
         from fxbot import notifier as slack
-        slack.configure(self.settings.slack)
-        self.backtest_tab.refresh_profiles()
+        from fxbot.mt5.symbols import clear_symbol_cache
+        if _dirty_matches(dirty, "slack."):
+            slack.configure(self.settings.slack)
+        # 口座・取引シンボルの変更時のみシンボル一覧を読み直す
+        if _dirty_matches(dirty, "active_account", "accounts.", "trading.active_symbols"):
+            clear_symbol_cache()
+        if _dirty_matches(dirty, "active_profile_id", "active_snapshot_id", "trade_logging."):
+            self.backtest_tab.refresh_profiles()
 
     def _on_account_changed(self, account_name: str):
         """口座切替時の処理."""
@@ -569,4 +582,5 @@ class MainWindow(QMainWindow):
             self.weekend_retrain_worker.wait(5000)
         if self.retrain_timer:
             self.retrain_timer.stop()
+        self.log_widget.shutdown()
         event.accept()
@@ -2,6 +2,9 @@
 
 from __future__ import annotations
 
+import dataclasses
+from typing import Any
+
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QFormLayout, QGroupBox,
     QLabel, QLineEdit, QSpinBox, QDoubleSpinBox, QComboBox,
@@ -9,7 +12,7 @@ from PySide6.QtWidgets import (
     QTabWidget, QScrollArea, QTableWidget, QTableWidgetItem, QHeaderView,
     QTextEdit,
 )
-from PySide6.QtCore import Qt, Signal, QTimer
+from PySide6.QtCore import Qt, Signal, QTimer, QSignalBlocker
 from PySide6.QtGui import QColor, QFont
 
 from fxbot.config import Settings, AccountConfig, save_settings
@@ -17,15 +20,44 @@ from fxbot.logger import get_logger
 
 log = get_logger(__name__)
 
+# 口座タイプ表示用スタイル（タイプ変化時のみ適用）
+_ACCOUNT_TYPE_STYLES = {
+    "real": "color: red; font-weight: bold;",
+    "demo": "color: green; font-weight: bold;",
+}
+
+
+def _flatten_settings(data: dict, prefix: str = "") -> dict[str, Any]:
+    """ネストした設定dictを "section.field" キーのフラットなdictへ変換."""
+    flat: dict[str, Any] = {}
+    for k, v in data.items():
+        key = f"{prefix}{k}"
+        if isinstance(v, dict):
+            flat.update(_flatten_settings(v, key + "."))
+        else:
+            flat[key] = v
+    return flat
+
+
+def _settings_snapshot(settings: Settings) -> dict[str, Any]:
+    """差分検出用の設定スナップショット."""
+    return _flatten_settings(dataclasses.asdict(settings))
+
+
+def _diff_settings(before: dict[str, Any], after: dict[str, Any]) -> set[str]:
+    """スナップショット間で値が変わったキー集合."""
+    return {k for k, v in after.items() if k not in before or before[k] != v}
+
 
 class SettingsTab(QWidget):
     """設定タブ."""
     account_changed = Signal(str)  # 口座切替シグナル
-    settings_changed = Signal()
+    settings_changed = Signal(set)  # 変更されたキー集合（例: "trading.max_positions"）
 
     def __init__(self, settings: Settings, parent=None):
         super().__init__(parent)
         self.settings = settings
+        self._last_account_type: str | None = None
         self._init_ui()
         self._load_settings()
 
@@ -57,7 +89,10 @@ class SettingsTab(QWidget):
 
         self.account_combo = QComboBox()
         self.account_combo.addItems(list(self.settings.accounts.keys()))
-        self.account_combo.currentTextChanged.connect(self._on_account_selected)
+        # 入力処理を塞がないよう、重めのスロットは次のイベントループで実行
+        self.account_combo.currentTextChanged.connect(
+            self._on_account_selected, type=Qt.ConnectionType.QueuedConnection,
+        )
         account_layout.addRow("アクティブ口座:", self.account_combo)
 
         self.server_edit = QLineEdit()
@@ -216,7 +251,9 @@ class SettingsTab(QWidget):
         mf_layout = QFormLayout()
 
         self.mf_enabled_check = QCheckBox("フィルターを有効にする（マスタースイッチ）")
-        self.mf_enabled_check.stateChanged.connect(self._on_mf_enabled_changed)
+        self.mf_enabled_check.stateChanged.connect(
+            self._on_mf_enabled_changed, type=Qt.ConnectionType.QueuedConnection,
+        )
         mf_layout.addRow(self.mf_enabled_check)
 
         # ADXフィルター
@@ -443,7 +480,9 @@ class SettingsTab(QWidget):
         self.profile_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
         self.profile_table.verticalHeader().setVisible(False)
         self.profile_table.setMinimumHeight(180)
-        self.profile_table.itemSelectionChanged.connect(self._on_profile_selected)
+        self.profile_table.itemSelectionChanged.connect(
+            self._on_profile_selected, type=Qt.ConnectionType.QueuedConnection,
+        )
         left.addWidget(self.profile_table)
         split.addLayout(left, 3)
 
@@ -610,7 +649,7 @@ class SettingsTab(QWidget):
         self.settings.active_profile_id = profile_id
         self.settings.active_snapshot_id = snapshot_id
         save_settings(self.settings)
-        self.settings_changed.emit()
+        self.settings_changed.emit({"active_profile_id", "active_snapshot_id"})
         self._refresh_profile_table()
         self.new_profile_name_edit.clear()
         self.new_profile_desc_edit.clear()
@@ -628,6 +667,7 @@ class SettingsTab(QWidget):
             QMessageBox.warning(self, "適用", "スナップショットが見つかりません。")
             return
 
+        before = _settings_snapshot(self.settings)
         try:
             from fxbot.profile_manager import ProfileManager
             pm = ProfileManager(self._get_db_path())
@@ -641,7 +681,7 @@ class SettingsTab(QWidget):
         self.settings.active_snapshot_id = snapshot_id
         save_settings(self.settings)
         self._load_settings()
-        self.settings_changed.emit()
+        self.settings_changed.emit(_diff_settings(before, _settings_snapshot(self.settings)))
         self._refresh_profile_table()
         QMessageBox.information(self, "適用", f"プロファイル「{p['name']}」を適用しました。")
         log.info(f"プロファイル適用: {p['name']} snapshot_id={snapshot_id}")
@@ -738,78 +778,85 @@ class SettingsTab(QWidget):
             QMessageBox.warning(self, "Slack テスト", "送信に失敗しました。\nWebhook URL を確認してください。")
 
     def _load_settings(self):
-        s = self.settings
-        self.account_combo.setCurrentText(s.active_account)
-        self._update_account_fields(s.active_account)
-
-        self.max_positions_spin.setValue(s.trading.max_positions)
-        self.max_active_symbols_spin.setValue(s.trading.max_active_symbols)
-        self.max_positions_per_symbol_spin.setValue(s.trading.max_positions_per_symbol)
-        self.prediction_horizon_spin.setValue(s.trading.prediction_horizon)
-        self.min_threshold_spin.setValue(s.trading.min_prediction_threshold)
-        self.max_lot_spin.setValue(s.trading.max_lot)
-        self.max_lot_balance_pct_spin.setValue(s.trading.max_lot_balance_pct)
-
-        self.risk_per_trade_spin.setValue(s.risk.max_risk_per_trade)
-        self.atr_sl_spin.setValue(s.risk.atr_sl_multiplier)
-        self.atr_tp_spin.setValue(s.risk.atr_tp_multiplier)
-        self.trailing_sl_check.setChecked(s.risk.trailing_sl_enabled)
-        self.trailing_tp_check.setChecked(s.risk.trailing_tp_enabled)
-
-        # モデル設定
-        mode_idx = self.model_mode_combo.findText(s.model.mode)
-        if mode_idx >= 0:
-            self.model_mode_combo.setCurrentIndex(mode_idx)
-        self.min_confidence_spin.setValue(s.trading.min_confidence)
-
-        # 市場フィルター
-        self.mf_enabled_check.setChecked(s.market_filter.enabled)
-        self.mf_adx_check.setChecked(s.market_filter.use_adx_filter)
-        self.mf_min_adx_spin.setValue(s.market_filter.min_adx)
-        self.mf_spread_check.setChecked(s.market_filter.use_spread_filter)
-        self.mf_max_spread_spin.setValue(s.market_filter.max_spread_pips)
-        self.mf_volatility_check.setChecked(s.market_filter.use_volatility_filter)
-        self.mf_min_atr_spin.setValue(s.market_filter.min_atr_pct)
-        self.mf_max_atr_spin.setValue(s.market_filter.max_atr_pct)
-        self.mf_session_check.setChecked(s.market_filter.session_only)
-
-        # 取引ログ
-        self.tl_enabled_check.setChecked(s.trade_logging.enabled)
-        self.tl_db_path_edit.setText(s.trade_logging.db_path)
-
-        # Slack 通知
-        self.slack_enabled_check.setChecked(s.slack.enabled)
-        self.slack_webhook_edit.setText(s.slack.webhook_url)
-        self.slack_notify_entry_check.setChecked(s.slack.notify_entry)
-        self.slack_notify_exit_check.setChecked(s.slack.notify_exit)
-        self.slack_notify_error_check.setChecked(s.slack.notify_error)
-        self.slack_notify_degraded_check.setChecked(s.slack.notify_model_degraded)
-        self.slack_notify_retraining_check.setChecked(s.slack.notify_retraining_done)
-        self.slack_notify_backtest_check.setChecked(s.slack.notify_backtest_done)
-
-        # 自動再学習
-        rt = s.retraining
-        self.rt_enabled_check.setChecked(rt.enabled)
-        self.rt_weekend_only_check.setChecked(rt.weekend_only)
-        self.rt_interval_spin.setValue(rt.interval_hours)
-        self.rt_wfo_check.setChecked(rt.run_wfo_before_train)
-        self.rt_wfo_win_rate_spin.setValue(rt.wfo_min_win_rate)
-        self.rt_wfo_sharpe_spin.setValue(rt.wfo_min_sharpe)
-        self.rt_monitor_window_spin.setValue(rt.monitor_window)
-        self.rt_min_win_rate_spin.setValue(rt.min_win_rate)
-        self.rt_min_sharpe_spin.setValue(rt.min_sharpe)
+        # プログラムからの一括反映中はスロット（口座欄更新・自動保存）を発火させない
+        with QSignalBlocker(self.account_combo), QSignalBlocker(self.mf_enabled_check):
+            s = self.settings
+            self.account_combo.setCurrentText(s.active_account)
+            self._update_account_fields(s.active_account)
+
+            self.max_positions_spin.setValue(s.trading.max_positions)
+            self.max_active_symbols_spin.setValue(s.trading.max_active_symbols)
+            self.max_positions_per_symbol_spin.setValue(s.trading.max_positions_per_symbol)
+            self.prediction_horizon_spin.setValue(s.trading.prediction_horizon)
+            self.min_threshold_spin.setValue(s.trading.min_prediction_threshold)
+            self.max_lot_spin.setValue(s.trading.max_lot)
+            self.max_lot_balance_pct_spin.setValue(s.trading.max_lot_balance_pct)
+
+            self.risk_per_trade_spin.setValue(s.risk.max_risk_per_trade)
+            self.atr_sl_spin.setValue(s.risk.atr_sl_multiplier)
+            self.atr_tp_spin.setValue(s.risk.atr_tp_multiplier)
+            self.trailing_sl_check.setChecked(s.risk.trailing_sl_enabled)
+            self.trailing_tp_check.setChecked(s.risk.trailing_tp_enabled)
+
+            # モデル設定
+            mode_idx = self.model_mode_combo.findText(s.model.mode)
+            if mode_idx >= 0:
+                self.model_mode_combo.setCurrentIndex(mode_idx)
+            self.min_confidence_spin.setValue(s.trading.min_confidence)
+
+            # 市場フィルター
+            self.mf_enabled_check.setChecked(s.market_filter.enabled)
+            self.mf_adx_check.setChecked(s.market_filter.use_adx_filter)
+            self.mf_min_adx_spin.setValue(s.market_filter.min_adx)
+            self.mf_spread_check.setChecked(s.market_filter.use_spread_filter)
+            self.mf_max_spread_spin.setValue(s.market_filter.max_spread_pips)
+            self.mf_volatility_check.setChecked(s.market_filter.use_volatility_filter)
+            self.mf_min_atr_spin.setValue(s.market_filter.min_atr_pct)
+            self.mf_max_atr_spin.setValue(s.market_filter.max_atr_pct)
+            self.mf_session_check.setChecked(s.market_filter.session_only)
+
+            # 取引ログ
+            self.tl_enabled_check.setChecked(s.trade_logging.enabled)
+            self.tl_db_path_edit.setText(s.trade_logging.db_path)
+
+            # Slack 通知
+            self.slack_enabled_check.setChecked(s.slack.enabled)
+            self.slack_webhook_edit.setText(s.slack.webhook_url)
+            self.slack_notify_entry_check.setChecked(s.slack.notify_entry)
+            self.slack_notify_exit_check.setChecked(s.slack.notify_exit)
+            self.slack_notify_error_check.setChecked(s.slack.notify_error)
+            self.slack_notify_degraded_check.setChecked(s.slack.notify_model_degraded)
+            self.slack_notify_retraining_check.setChecked(s.slack.notify_retraining_done)
+            self.slack_notify_backtest_check.setChecked(s.slack.notify_backtest_done)
+
+            # 自動再学習
+            rt = s.retraining
+            self.rt_enabled_check.setChecked(rt.enabled)
+            self.rt_weekend_only_check.setChecked(rt.weekend_only)
+            self.rt_interval_spin.setValue(rt.interval_hours)
+            self.rt_wfo_check.setChecked(rt.run_wfo_before_train)
+            self.rt_wfo_win_rate_spin.setValue(rt.wfo_min_win_rate)
+            self.rt_wfo_sharpe_spin.setValue(rt.wfo_min_sharpe)
+            self.rt_monitor_window_spin.setValue(rt.monitor_window)
+            self.rt_min_win_rate_spin.setValue(rt.min_win_rate)
+            self.rt_min_sharpe_spin.setValue(rt.min_sharpe)
 
     def _update_account_fields(self, name: str):
         acc = self.settings.accounts.get(name)
         if acc:
-            self.server_edit.setText(acc.server)
-            self.login_edit.setValue(acc.login)
-            self.password_edit.setText(acc.password)
+            with (
+                QSignalBlocker(self.server_edit),
+                QSignalBlocker(self.login_edit),
+                QSignalBlocker(self.password_edit),
+            ):
+                self.server_edit.setText(acc.server)
+                self.login_edit.setValue(acc.login)
+                self.password_edit.setText(acc.password)
             self.account_type_label.setText(acc.type.upper())
-            if acc.type == "real":
-                self.account_type_label.setStyleSheet("color: red; font-weight: bold;")
-            else:
-                self.account_type_label.setStyleSheet("color: green; font-weight: bold;")
+            style_key = "real" if acc.type == "real" else "demo"
+            if style_key != self._last_account_type:
+                self.account_type_label.setStyleSheet(_ACCOUNT_TYPE_STYLES[style_key])
+                self._last_account_type = style_key
 
     def _on_account_selected(self, name: str):
         self._update_account_fields(name)
@@ -848,6 +895,7 @@ class SettingsTab(QWidget):
 
     def _save_settings(self):
         s = self.settings
+        before = _settings_snapshot(s)
 
         # 現在の口座設定を保存
         name = self.account_combo.currentText()
@@ -907,9 +955,16 @@ class SettingsTab(QWidget):
         s.retraining.min_win_rate = self.rt_min_win_rate_spin.value()
         s.retraining.min_sharpe = self.rt_min_sharpe_spin.value()
 
+        dirty = _diff_settings(before, _settings_snapshot(s))
+        if not dirty:
+            # 変更なし — YAML/.env の書き込みと下流の再初期化を省略
+            log.info("設定変更なし（保存をスキップ）")
+            QMessageBox.information(self, "保存", "変更はありません。")
+            return
+
         save_settings(self.settings)
-        self.settings_changed.emit()
-        log.info("設定保存完了")
+        self.settings_changed.emit(dirty)
+        log.info(f"設定保存完了 (変更: {len(dirty)}項目)")
         QMessageBox.information(self, "保存", "設定を保存しました。")
 
     # --- 発注テスト ---
@@ -917,7 +972,6 @@ class SettingsTab(QWidget):
     def _on_test_order(self):
         """USDJPYを最小ロットで発注し、10秒後に決済するテスト."""
         from fxbot.mt5.symbols import load_symbols
-        from fxbot.mt5.execution import send_order, close_position
 
         # symbols.json からUSDJPYの実際のシンボル名とvolume_minを取得
         symbols = load_symbols(self.settings)
@@ -934,19 +988,35 @@ class SettingsTab(QWidget):
             QMessageBox.warning(self, "エラー", "USDJPYシンボルが見つかりません。\nシンボル検出を先に実行してください。")
             return
 
-        reply = QMessageBox.question(
-            self,
-            "発注テスト確認",
+        # 非モーダルで確認し、イベントループ（他タブの更新）を止めない
+        mb = QMessageBox(self)
+        mb.setIcon(QMessageBox.Icon.Question)
+        mb.setWindowTitle("発注テスト確認")
+        mb.setText(
             f"{test_symbol}を最小ロット({volume_min})で成行BUYし、\n"
-            "10秒後に自動決済します。\n\n実行しますか？",
-            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
-            QMessageBox.StandardButton.No,
+            "10秒後に自動決済します。\n\n実行しますか？"
         )
+        mb.setStandardButtons(QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
+        mb.setDefaultButton(QMessageBox.StandardButton.No)
+        mb.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
+        mb.finished.connect(
+            lambda _result: self._continue_test_order(
+                mb.standardButton(mb.clickedButton()), test_symbol, volume_min,
+            )
+        )
+        self.test_order_btn.setEnabled(False)
+        mb.open()
+
+    def _continue_test_order(
+        self, reply: QMessageBox.StandardButton, test_symbol: str, volume_min: float,
+    ) -> None:
+        """発注テスト確認ダイアログ終了後の処理."""
+        from fxbot.mt5.execution import send_order, close_position
+
         if reply != QMessageBox.StandardButton.Yes:
+            self.test_order_btn.setEnabled(True)
             return
 
-        self.test_order_btn.setEnabled(False)
-
         # MT5の自動売買が有効か事前チェック
         import MetaTrader5 as mt5
         ti = mt5.terminal_info()
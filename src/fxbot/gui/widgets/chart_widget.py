@@ -14,12 +14,13 @@ for _font in _JP_FONTS:
         matplotlib.rcParams["font.family"] = _font
         break
 
+import numpy as np
 from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
 from matplotlib.ticker import FuncFormatter
 
 from PySide6.QtCore import Signal
-from PySide6.QtWidgets import QDialog, QLabel, QVBoxLayout, QWidget
+from PySide6.QtWidgets import QDialog, QLabel, QSizePolicy, QVBoxLayout, QWidget
 
 
 class InteractiveFigureCanvas(FigureCanvas):
@@ -37,20 +38,32 @@ class ChartWidget(QWidget):
 
     def __init__(self, parent=None, figsize=(10, 6)):
         super().__init__(parent)
-        layout = QVBoxLayout(self)
-        layout.setContentsMargins(0, 0, 0, 0)
+        self._layout = QVBoxLayout(self)
+        self._layout.setContentsMargins(0, 0, 0, 0)
+        self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
+
+        # Figure/Canvas は最初の描画時に生成（未表示タブのメモリ・起動コストを削減）
+        self._figsize = figsize
+        self.figure: Figure | None = None
+        self.canvas: InteractiveFigureCanvas | None = None
+        self._last_plot_renderer = None
+        self._dialog_title = "チャート"
 
-        self.figure = Figure(figsize=figsize, dpi=100)
+    def _ensure_canvas(self) -> None:
+        """Figure/Canvas を必要になった時点で生成."""
+        if self.canvas is not None:
+            return
+        self.figure = Figure(figsize=self._figsize, dpi=100)
         self.canvas = InteractiveFigureCanvas(self.figure)
         self.canvas.double_clicked.connect(self._open_zoom_dialog)
-        layout.addWidget(self.canvas)
-        self._last_plot_renderer = None
-        self._dialog_title = "チャート"
+        self._layout.addWidget(self.canvas)
 
     def clear(self):
-        self.figure.clear()
         self._last_plot_renderer = None
         self._dialog_title = "チャート"
+        if self.canvas is None:
+            return
+        self.figure.clear()
         self.canvas.draw()
 
     def _remember_plot(self, title: str, renderer) -> None:
@@ -82,6 +95,7 @@ class ChartWidget(QWidget):
             "資金曲線",
             lambda target: target.plot_equity(equity_copy, initial_balance),
         )
+        self._ensure_canvas()
         self.figure.clear()
         ax = self.figure.add_subplot(111)
         ax.plot(equity_series.index, equity_series.values, color="#2196F3", linewidth=1)
@@ -119,6 +133,7 @@ class ChartWidget(QWidget):
             title,
             lambda target: target.plot_multi_equity(curves_copy, initial_balance, title),
         )
+        self._ensure_canvas()
         self.figure.clear()
         ax = self.figure.add_subplot(111)
         colors = ["#9E9E9E", "#03A9F4", "#4CAF50", "#FF9800"]
@@ -144,6 +159,7 @@ class ChartWidget(QWidget):
             "SHAP重要度",
             lambda target: target.plot_shap_importance(importance_copy, top_n),
         )
+        self._ensure_canvas()
         self.figure.clear()
         ax = self.figure.add_subplot(111)
 
@@ -161,14 +177,18 @@ class ChartWidget(QWidget):
             "ドローダウン",
             lambda target: target.plot_drawdown(equity_copy),
         )
+        self._ensure_canvas()
         self.figure.clear()
         ax = self.figure.add_subplot(111)
 
-        peak = equity_series.cummax()
-        dd_pct = (equity_series - peak) / peak * 100
+        # Series 演算（index 整列）を避け、ndarray 上で直接計算
+        dates = equity_series.index
+        values = equity_series.to_numpy(dtype=np.float64)
+        peak = np.maximum.accumulate(values)
+        dd_pct = (values - peak) / peak * 100.0
 
-        ax.fill_between(dd_pct.index, dd_pct.values, 0, color="#F44336", alpha=0.3)
-        ax.plot(dd_pct.index, dd_pct.values, color="#F44336", linewidth=0.5)
+        ax.fill_between(dates, dd_pct, 0, color="#F44336", alpha=0.3)
+        ax.plot(dates, dd_pct, color="#F44336", linewidth=0.5)
         ax.set_title("Drawdown (%)", fontsize=12)
         ax.set_xlabel("Date")
         ax.set_ylabel("Drawdown %")
@@ -193,6 +213,7 @@ class ChartWidget(QWidget):
             f"{symbol} ローソク足" if symbol else "ローソク足",
             lambda target: target.plot_candlestick(df_copy, hold_copy, symbol),
         )
+        self._ensure_canvas()
         self.figure.clear()
 
         if df is None or df.empty:
@@ -3,26 +3,50 @@
 from __future__ import annotations
 
 import logging
+import time
 
-from PySide6.QtWidgets import QComboBox, QHBoxLayout, QLabel, QTextEdit, QVBoxLayout, QWidget
-from PySide6.QtCore import Signal, QObject
+from PySide6.QtWidgets import QComboBox, QHBoxLayout, QLabel, QPlainTextEdit, QVBoxLayout, QWidget
+from PySide6.QtCore import Q_ARG, QMetaObject, QTimer, Qt, Slot
 from PySide6.QtGui import QTextCursor
 
+from fxbot.logger import add_listener_handler, remove_listener_handler
 
-class LogSignal(QObject):
-    new_log = Signal(str)
+
+# 取引ループ毎に大量のINFOを出すモジュール（WARNING以上のみGUIへ流す）
+_NOISY_LOGGERS = ("fxbot.mt5.data_feed",)
+
+
+def _drop_noisy(record: logging.LogRecord) -> bool:
+    return record.levelno >= logging.WARNING or not record.name.startswith(_NOISY_LOGGERS)
+
+
+class _CachedTimeFormatter(logging.Formatter):
+    """秒単位の時刻文字列を同一秒内で使い回すフォーマッタ."""
+
+    _last_sec = -1
+    _last_str = ""
+
+    def formatTime(self, record, datefmt=None):
+        sec = int(record.created)
+        if sec != self._last_sec:
+            self._last_str = time.strftime(datefmt or self.default_time_format, time.localtime(sec))
+            self._last_sec = sec
+        return self._last_str
 
 
 class QTextEditHandler(logging.Handler):
-    """ログをQTextEditに転送するハンドラ."""
+    """ログをテキストビューに転送するハンドラ."""
 
-    def __init__(self):
+    def __init__(self, widget: LogWidget):
         super().__init__()
-        self.signal = LogSignal()
+        self._widget = widget
 
     def emit(self, record):
         msg = self.format(record)
-        self.signal.new_log.emit(msg)
+        # 受け手は LogWidget 1つだけなので、シグナルを介さずスロットへ直接キューイング
+        QMetaObject.invokeMethod(
+            self._widget, "_append_log", Qt.ConnectionType.QueuedConnection, Q_ARG(str, msg),
+        )
 
 
 class LogWidget(QWidget):
@@ -33,6 +57,7 @@ class LogWidget(QWidget):
         ("INFO", logging.INFO),
         ("ERROR", logging.ERROR),
     ]
+    _MAX_LINES = 5000
 
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -51,30 +76,59 @@ class LogWidget(QWidget):
         header.addStretch()
         layout.addLayout(header)
 
-        self.text_edit = QTextEdit()
+        self.text_edit = QPlainTextEdit()
         self.text_edit.setReadOnly(True)
         self.text_edit.setStyleSheet(
-            "QTextEdit { font-family: 'Consolas', monospace; font-size: 11px; "
+            "QPlainTextEdit { font-family: 'Consolas', monospace; font-size: 11px; "
             "background-color: #1e1e1e; color: #d4d4d4; }"
         )
+        # 古い行から自動的に破棄し、長時間稼働でもメモリと追記コストを一定に保つ
+        self.text_edit.setMaximumBlockCount(self._MAX_LINES)
         layout.addWidget(self.text_edit)
 
+        # 短時間に届いたログをまとめて1回の append で反映する
+        self._pending: list[str] = []
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(50)
+        self._flush_timer.timeout.connect(self._flush)
+
         # ログハンドラ設定
-        self.handler = QTextEditHandler()
+        self.handler = QTextEditHandler(self)
         self.handler.setLevel(logging.WARNING)
-        self.handler.setFormatter(logging.Formatter(
+        self.handler.addFilter(_drop_noisy)
+        self.handler.setFormatter(_CachedTimeFormatter(
             "%(asctime)s [%(levelname)-8s] %(message)s",
             datefmt="%H:%M:%S",
         ))
-        self.handler.signal.new_log.connect(self._append_log)
 
-        logger = logging.getLogger("fxbot")
-        logger.addHandler(self.handler)
+        # 整形とシグナル送出は setup_logger のリスナースレッドで行い、
+        # ワーカー側の log 呼び出しを軽くする（未構成時はロガーへ直接追加）
+        self._on_listener = add_listener_handler(self.handler)
+        if not self._on_listener:
+            logging.getLogger("fxbot").addHandler(self.handler)
+
+    def shutdown(self) -> None:
+        """ハンドラを外す."""
+        if self._on_listener:
+            remove_listener_handler(self.handler)
+        else:
+            logging.getLogger("fxbot").removeHandler(self.handler)
 
     def _on_level_changed(self, index: int) -> None:
         _, level = self._LEVELS[index]
         self.handler.setLevel(level)
 
+    @Slot(str)
     def _append_log(self, msg: str):
-        self.text_edit.append(msg)
+        self._pending.append(msg)
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+
+    def _flush(self) -> None:
+        if not self._pending:
+            return
+        text = "\n".join(self._pending)
+        self._pending.clear()
+        self.text_edit.appendPlainText(text)
         self.text_edit.moveCursor(QTextCursor.MoveOperation.End)
@@ -1,14 +1,14 @@
-"""QThreadワーカー — データ取得/学習/ライブ取引."""
+"""スレッドワーカー — データ取得/学習/ライブ取引."""
 
 from __future__ import annotations
 
 import dataclasses
-import time
 import traceback
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 
 import pandas as pd
-from PySide6.QtCore import QThread, Signal, QObject
+from PySide6.QtCore import QThread, Signal, Slot, QObject, QMutex, QWaitCondition
 
 from fxbot.config import Settings
 from fxbot.logger import get_logger
@@ -26,9 +26,52 @@ class WorkerSignals(QObject):
     filter_update = Signal(object)  # dict: {symbol, filter_statuses, ohlcv_df, hold_timestamp}
 
 
-class DataFetchWorker(QThread):
+class ThreadedWorker(QObject):
+    """専用 QThread へ moveToThread して run() を実行するワーカー基底.
+
+    QThread をサブクラス化せず、イベントループを持つスレッド上のスロットとして
+    run() を実行する。呼び出し側向けに start/isRunning/wait を QThread 互換で提供する。
+    サブクラスは run() の実装が必須（未実装なら生成時に TypeError）。
+    """
+
+    def __init__(self, parent=None):
+        if type(self).run is ThreadedWorker.run:
+            raise TypeError(f"{type(self).__name__} は run() を実装していません")
+        super().__init__()
+        self.signals = WorkerSignals()
+        self._thread = QThread(parent)
+        self.moveToThread(self._thread)
+        self._thread.started.connect(self._execute)
+
+    @Slot()
+    def _execute(self) -> None:
+        try:
+            self.run()
+        except Exception as e:
+            # run() 内で捕捉されなかった例外もワーカースレッドで握り潰さず通知する
+            log.exception("ワーカー実行エラー: %s", type(self).__name__)
+            self.signals.error.emit(f"ワーカーエラー: {e}\n{traceback.format_exc()}")
+        finally:
+            self._thread.quit()
+
+    def run(self) -> None:
+        """ワーカースレッド上で実行する本体（サブクラスで実装）."""
+        raise NotImplementedError
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def isRunning(self) -> bool:
+        return self._thread.isRunning()
+
+    def wait(self, msecs: int | None = None) -> bool:
+        if msecs is None:
+            return self._thread.wait()
+        return self._thread.wait(msecs)
+
+
+class DataFetchWorker(ThreadedWorker):
     """OHLCV取得ワーカー."""
-    signals = WorkerSignals()
 
     def __init__(self, symbol: str, settings: Settings, parent=None):
         super().__init__(parent)
@@ -52,9 +95,29 @@ class DataFetchWorker(QThread):
         self._running = False
 
 
-class TrainWorker(QThread):
+class MultiSymbolDataFetchWorker(ThreadedWorker):
+    """複数シンボルのOHLCVを1スレッドでまとめて取得するワーカー."""
+
+    def __init__(self, symbols: list[str], settings: Settings, parent=None):
+        super().__init__(parent)
+        self.symbols = list(symbols)
+        self.settings = settings
+
+    def run(self):
+        try:
+            self.signals.started.emit()
+            self.signals.progress.emit(f"{len(self.symbols)}シンボル データ取得中...")
+
+            from fxbot.mt5.data_feed import fetch_multi_symbol
+            data = fetch_multi_symbol(self.symbols, self.settings)
+
+            self.signals.finished.emit(data)
+        except Exception as e:
+            self.signals.error.emit(f"データ取得エラー: {e}\n{traceback.format_exc()}")
+
+
+class TrainWorker(ThreadedWorker):
     """モデル学習ワーカー."""
-    signals = WorkerSignals()
 
     def __init__(self, multi_tf_data: dict, symbol: str, settings: Settings, parent=None):
         super().__init__(parent)
@@ -81,8 +144,14 @@ class TrainWorker(QThread):
             fm = build_feature_matrix(self.multi_tf_data, self.settings.data.base_timeframe)
             self.signals.progress.emit(f"特徴量: {fm.shape[1]}列")
 
-            # 全特徴量で学習
+            # データ不足なら学習・SHAPを実行せず終了
             horizon = self.settings.trading.prediction_horizon
+            min_rows = horizon + self.settings.model.min_train_rows
+            if len(fm) < min_rows:
+                self.signals.error.emit(f"学習エラー: データ不足 ({len(fm)}行 < {min_rows}行)")
+                return
+
+            # 全特徴量で学習
             X, y, feat_names = prepare_dataset(fm, horizon, mode=model_mode)
             self.signals.progress.emit(f"学習中（全特徴量, {model_mode}）...")
             model_full, _ = train_model(X, y, self.settings, mode=model_mode)
@@ -96,7 +165,8 @@ class TrainWorker(QThread):
 
             # 選択特徴量で再学習
             self.signals.progress.emit(f"再学習中（{len(selected)}特徴量）...")
-            X_sel, y_sel, _ = prepare_dataset(fm, horizon, selected, mode=model_mode)
+            # ラベル再計算を避け、全特徴量データセットから列だけ切り出す
+            X_sel, y_sel = X.loc[:, selected], y
             model, metrics = train_model(X_sel, y_sel, self.settings, mode=model_mode)
             metrics["mode"] = model_mode
 
@@ -118,9 +188,8 @@ class TrainWorker(QThread):
             self.signals.error.emit(f"学習エラー: {e}\n{traceback.format_exc()}")
 
 
-class BacktestWorker(QThread):
+class BacktestWorker(ThreadedWorker):
     """バックテストワーカー."""
-    signals = WorkerSignals()
 
     def __init__(self, symbol: str, settings: Settings, parent=None):
         super().__init__(parent)
@@ -163,9 +232,8 @@ class ComparisonResult:
     clf_metrics_065: dict
 
 
-class ComparisonWorker(QThread):
+class ComparisonWorker(ThreadedWorker):
     """回帰 vs 分類 × 3閾値の比較バックテストワーカー."""
-    signals = WorkerSignals()
 
     def __init__(self, symbol: str, settings: Settings, parent=None):
         super().__init__(parent)
@@ -227,9 +295,8 @@ class ComparisonWorker(QThread):
             self.signals.error.emit(f"比較バックテストエラー: {e}\n{traceback.format_exc()}")
 
 
-class WeekendRetrainWorker(QThread):
+class WeekendRetrainWorker(ThreadedWorker):
     """週末自動WFO→学習ワーカー."""
-    signals = WorkerSignals()
 
     def __init__(self, multi_tf_data: dict, symbol: str, settings: Settings, parent=None):
         super().__init__(parent)
@@ -293,6 +360,13 @@ class WeekendRetrainWorker(QThread):
             fm = build_feature_matrix(self.multi_tf_data, self.settings.data.base_timeframe)
             self.signals.progress.emit(f"特徴量: {fm.shape[1]}列")
 
+            min_rows = horizon + self.settings.model.min_train_rows
+            if len(fm) < min_rows:
+                self.signals.error.emit(
+                    f"週末自動再学習エラー: データ不足 ({len(fm)}行 < {min_rows}行)"
+                )
+                return
+
             X, y, _ = prepare_dataset(fm, horizon, mode=model_mode)
             self.signals.progress.emit("全特徴量で学習中...")
             model_full, _ = train_model(X, y, self.settings, mode=model_mode)
@@ -303,7 +377,7 @@ class WeekendRetrainWorker(QThread):
             )
 
             self.signals.progress.emit(f"選択特徴量で再学習中（{len(selected)}列）...")
-            X_sel, y_sel, _ = prepare_dataset(fm, horizon, selected, mode=model_mode)
+            X_sel, y_sel = X.loc[:, selected], y
             model, train_metrics = train_model(X_sel, y_sel, self.settings, mode=model_mode)
             train_metrics["mode"] = model_mode
 
@@ -333,35 +407,44 @@ class WeekendRetrainWorker(QThread):
             self.signals.error.emit(f"週末自動再学習エラー: {e}\n{traceback.format_exc()}")
 
 
-class TradingWorker(QThread):
+class TradingWorker(ThreadedWorker):
     """ライブ取引ワーカー — Phase 7で本実装."""
-    signals = WorkerSignals()
 
     def __init__(self, settings: Settings, parent=None):
         super().__init__(parent)
         self.settings = settings
         self._running = True
+        # stop() で待機中のスレッドを即座に起こすための待機条件
+        self._mutex = QMutex()
+        self._cond = QWaitCondition()
 
     def run(self):
+        feature_pool: ThreadPoolExecutor | None = None
         try:
             self.signals.started.emit()
             self.signals.progress.emit("ライブ取引開始...")
 
             from fxbot.mt5.connection import connect, is_connected, reconnect
-            from fxbot.mt5.data_feed import fetch_and_cache
+            from fxbot.mt5.data_feed import fetch_multi_timeframe
             from fxbot.features.builder import build_feature_matrix
             from fxbot.model.predictor import Predictor
-            from fxbot.model.registry import load_model
-            from fxbot.strategy.signal import generate_signal, SignalAction
+            from fxbot.model.registry import list_models, load_model
+            from fxbot.strategy.signal import (
+                SignalAction, generate_signal, get_filter_statuses, in_trading_session,
+            )
             from fxbot.risk.portfolio import can_open_position, get_open_positions
-            from fxbot.mt5.execution import send_order
-            from fxbot.risk.stop_manager import update_trailing_stop, StopLevels
+            from fxbot.mt5.execution import send_order, get_deal_history
+            from fxbot.trade_logger import TradeRecord
             from fxbot import notifier as _slack
 
             import MetaTrader5 as mt5
             from datetime import datetime, timezone
             from zoneinfo import ZoneInfo
 
+            # ループ内で毎回引く MT5 関数はローカルに束縛しておく
+            symbol_info = mt5.symbol_info
+            account_info_fn = mt5.account_info
+
             # 取引ログは日本時間(JST)で記録（execution.pyの決済時刻と統一）
             JST = ZoneInfo("Asia/Tokyo")
 
@@ -374,7 +457,7 @@ class TradingWorker(QThread):
             run_id = ""
             _pm = None
             if self.settings.trade_logging.enabled:
-                from fxbot.trade_logger import TradeLogger, TradeRecord
+                from fxbot.trade_logger import TradeLogger
                 from fxbot.model.monitor import ModelMonitor
                 db_path = self.settings.resolve_path(self.settings.trade_logging.db_path)
                 trade_logger = TradeLogger(db_path)
@@ -391,24 +474,18 @@ class TradingWorker(QThread):
             model_mode = getattr(self.settings.model, "mode", "regression")
 
             # 学習済みモデルが存在するシンボルを自動検出
-            from fxbot.model.registry import list_models
             tf = self.settings.data.base_timeframe
 
-            all_trained = list_models(self.settings)
-            # シンボルごとに最新モデルだけ残す
-            seen_symbols = set()
+            # シンボルごとに最新モデルだけ取得
             models: dict[str, tuple] = {}
-            for meta_info in all_trained:
+            for meta_info in list_models(self.settings, timeframe=tf, latest_per_symbol=True):
                 sym = meta_info.get("symbol", "")
-                if sym in seen_symbols or meta_info.get("timeframe") != tf:
-                    continue
-                seen_symbols.add(sym)
                 model_dir = Path(meta_info["path"])
                 model, meta = load_model(model_dir)
-                # メタデータからモードを取得（なければ metrics サブ辞書 → 設定の順で fallback）
-                pred_mode = meta.get("mode") or meta.get("metrics", {}).get("mode", model_mode)
-                models[sym] = (Predictor(model, meta["feature_names"], mode=pred_mode), meta)
-                log.info(f"取引モデル読込: {sym} ({model_dir.name}) mode={pred_mode}")
+                # メタデータのモードに応じた専用 Predictor を生成（なければ設定のモード）
+                predictor = Predictor.from_meta(model, meta, default_mode=model_mode)
+                models[sym] = (predictor, meta)
+                log.info(f"取引モデル読込: {sym} ({model_dir.name}) mode={predictor.mode}")
 
             if not models:
                 self.signals.error.emit("取引可能なモデルがありません。先に学習を実行してください。")
@@ -416,6 +493,18 @@ class TradingWorker(QThread):
 
             self.signals.progress.emit(f"取引対象: {list(models.keys())}")
 
+            # point はセッション中不変なので起動時に一度だけ取得
+            points: dict[str, float] = {}
+            for sym in models:
+                _si = symbol_info(sym)
+                points[sym] = _si.point if _si and _si.point else 0.0001
+
+            # 特徴量構築用スレッドプール（MT5呼び出しはこのスレッドで直列に行う）
+            base_tf = self.settings.data.base_timeframe
+            feature_pool = ThreadPoolExecutor(
+                max_workers=min(4, len(models)), thread_name_prefix="fxbot-features",
+            )
+
             # プロファイルセッション開始
             if trade_logger and self.settings.active_profile_id:
                 from fxbot.profile_manager import ProfileManager
@@ -442,6 +531,8 @@ class TradingWorker(QThread):
             tp_triggered: set[int] = set()
             # シンボルごとの最新ATR（セッション外トレーリング更新用）
             last_atr: dict[str, float] = {sym: 0.0 for sym in models}
+            # シンボルごとの処理済み最新バー時刻（新バー未確定なら特徴量再構築をスキップ）
+            last_bar_ts: dict[str, pd.Timestamp] = {}
             # MT5チケット → DBのrow_id マッピング（ticket=NULL時のフォールバック用）
             open_trade_ids: dict[int, int] = {}
             # MT5チケット → {direction, lot, entry_price} マッピング（Slack通知用）
@@ -451,6 +542,8 @@ class TradingWorker(QThread):
             MAX_EXIT_RETRIES = 5
             # モデル劣化フラグ（劣化検知時に新規エントリーを停止）
             model_degraded = False
+            # 決済を記録したら立てる（ModelMonitor は決済があった周回だけ評価。初回は必ず評価）
+            monitor_dirty = True
 
             # 起動時同期: MT5履歴でDB未決済レコードを更新
             if trade_logger:
@@ -462,7 +555,6 @@ class TradingWorker(QThread):
                     _tk = _row["ticket"]
                     if _tk in _open_tickets_now:
                         continue  # まだオープン中
-                    from fxbot.mt5.execution import get_deal_history
                     _deal = get_deal_history(_tk)
                     if _deal:
                         _reason = _deal.get("reason", "unknown")
@@ -491,30 +583,34 @@ class TradingWorker(QThread):
                 for sym in models:
                     prev_tickets[sym] = {p["ticket"] for p in _open_positions_init if p["symbol"] == sym}
 
+            emit_progress = self.signals.progress.emit
+            emit_filter_update = self.signals.filter_update.emit
+
             while self._running:
                 predictions_this_bar: dict[str, float] = {}
+                # ループ1周ごとに設定セクションをローカルへ束縛（属性探索を削減）
+                settings = self.settings
+                mf_cfg = settings.market_filter
+                min_threshold = settings.trading.min_prediction_threshold
+                profile_id = settings.active_profile_id or None
+                snapshot_id = settings.active_snapshot_id or None
+
                 if not is_connected():
-                    self.signals.progress.emit("再接続中...")
-                    if not reconnect(self.settings):
-                        time.sleep(30)
+                    emit_progress("再接続中...")
+                    if not reconnect(settings):
+                        self._sleep(30)
                         continue
 
                 # セッション外スキップ（データ取得・特徴量構築・シグナル生成をすべてスキップ）
-                if (self.settings.market_filter.enabled
-                        and self.settings.market_filter.session_only):
+                if mf_cfg.enabled and mf_cfg.session_only:
                     hour_utc = datetime.utcnow().hour
-                    in_session = (7 <= hour_utc < 16) or (13 <= hour_utc < 22)
-                    if not in_session:
+                    if not in_trading_session(hour_utc):
                         log.debug(f"セッション外スキップ (UTC={hour_utc}時) — 15分待機")
                         # セッション外でも既存ポジションのトレーリングストップは更新する
                         self._update_trailing_stops(models, last_atr, trailing_activated, tp_triggered)
-                        _interval = self.settings.risk.trailing_update_interval
-                        for _i in range(900):
-                            if not self._running:
-                                break
-                            time.sleep(1)
-                            if _interval and (_i + 1) % _interval == 0:
-                                self._update_trailing_stops(models, last_atr, trailing_activated, tp_triggered)
+                        self._sleep_with_trailing_updates(
+                            900, models, last_atr, trailing_activated, tp_triggered,
+                        )
                         continue
 
                 # ペンディング決済のリトライ（前バーで履歴取得できなかったチケット）
@@ -522,12 +618,12 @@ class TradingWorker(QThread):
                     for ticket in list(pending_exits.keys()):
                         info = pending_exits[ticket]
                         try:
-                            from fxbot.mt5.execution import get_deal_history
                             deal = get_deal_history(ticket)
                             if deal:
                                 reason = deal.get("reason", "unknown")
                                 if reason == "sl" and info.get("was_trailing", False):
                                     reason = "trailing"
+                                monitor_dirty = True
                                 trade_logger.log_exit(
                                     ticket=ticket,
                                     exit_price=deal.get("price", 0.0),
@@ -557,18 +653,48 @@ class TradingWorker(QThread):
                         except Exception as ex:
                             log.warning(f"ペンディング決済リトライ失敗 ticket={ticket}: {ex}")
 
+                # 口座残高はループ1周につき1回だけ取得し、全シンボルで共有
+                account_info = account_info_fn()
+                balance = account_info.balance if account_info else 10000
+
+                # オープンポジションも周回頭で1回だけ取得（クローズ検出・チケット集合更新・
+                # 建玉上限判定で共用。上限判定用には今周回の約定分を追記していく）
+                open_positions = get_open_positions()
+                open_tickets_by_sym: dict[str, set[int]] = {}
+                for p in open_positions:
+                    open_tickets_by_sym.setdefault(p["symbol"], set()).add(p["ticket"])
+
+                # データ取得は直列、特徴量構築はプールへ投入して次シンボルの取得と重ねる。
+                # バー時刻はジョブと一緒に持ち回り、処理完了後に処理済みとして記録する
+                feature_jobs: dict[str, tuple[dict | None, pd.Timestamp | None, Future]] = {}
+                for sym in models:
+                    try:
+                        data = fetch_multi_timeframe(sym, settings)
+                    except Exception as e:
+                        failed: Future = Future()
+                        failed.set_exception(e)
+                        feature_jobs[sym] = (None, None, failed)
+                        continue
+                    if not data or base_tf not in data:
+                        continue
+                    bar_ts = data[base_tf].index[-1]
+                    if last_bar_ts.get(sym) == bar_ts:
+                        log.debug("%s: 新しいバーなし（%s）— スキップ", sym, bar_ts)
+                        continue
+                    feature_jobs[sym] = (
+                        data, bar_ts, feature_pool.submit(build_feature_matrix, data, base_tf),
+                    )
+
                 for sym, (predictor, meta) in models.items():
+                    bar_ts = None
+                    order_success = False
                     try:
                         # クローズ検出: 前回あったチケットが消えた → exit記録
                         if trade_logger and prev_tickets[sym]:
-                            current_positions = get_open_positions()
-                            current_tickets = {
-                                p["ticket"] for p in current_positions if p["symbol"] == sym
-                            }
+                            current_tickets = open_tickets_by_sym.get(sym, set())
                             closed_tickets = prev_tickets[sym] - current_tickets
                             for ticket in closed_tickets:
                                 try:
-                                    from fxbot.mt5.execution import get_deal_history
                                     deal = get_deal_history(ticket)
                                     if deal:
                                         reason = deal.get("reason", "unknown")
@@ -576,6 +702,7 @@ class TradingWorker(QThread):
                                             reason = "trailing"
                                         _db_row_id = open_trade_ids.pop(ticket, None)
                                         _trade_info = open_trade_info.pop(ticket, {})
+                                        monitor_dirty = True
                                         trade_logger.log_exit(
                                             ticket=ticket,
                                             exit_price=deal.get("price", 0.0),
@@ -619,29 +746,21 @@ class TradingWorker(QThread):
                                     log.warning(f"クローズ記録失敗 ticket={ticket}: {ex} — リトライキューに追加")
                                 finally:
                                     trailing_activated.discard(ticket)
+                            # 新バー待ちでスキップしても同じクローズを二重記録しないよう即時反映
+                            prev_tickets[sym] -= closed_tickets
 
-                        # データ取得
-                        from fxbot.mt5.data_feed import fetch_multi_timeframe
-                        data = fetch_multi_timeframe(sym, self.settings)
-                        if not data:
+                        # データ取得・特徴量構築（先行投入したジョブの結果を受け取る）
+                        job = feature_jobs.get(sym)
+                        if job is None:
                             continue
-
-                        # 特徴量構築
-                        fm = build_feature_matrix(data, self.settings.data.base_timeframe)
+                        data, bar_ts, fm_future = job
+                        fm = fm_future.result()
                         if fm.empty:
+                            last_bar_ts[sym] = bar_ts
                             continue
 
-                        # 予測・信頼度
-                        confidence = 1.0
-                        if predictor.mode == "classification":
-                            direction, confidence = predictor.predict_latest_with_confidence(fm)
-                            pred_val = float(direction) * confidence  # 方向 × 信頼度を予測値として使用
-                        else:
-                            pred_val = predictor.predict_latest(fm)
-                            # 回帰モードでは予測強度を信頼度代替として計算
-                            # threshold の3倍で confidence=1.0 になるよう正規化
-                            _thr = self.settings.trading.min_prediction_threshold
-                            confidence = min(abs(pred_val) / max(_thr * 3.0, 1e-10), 1.0)
+                        # 予測・信頼度（モード別の計算は Predictor サブクラス側）
+                        pred_val, confidence = predictor.predict_latest_for_trade(fm, min_threshold)
 
                         predictions_this_bar[sym] = pred_val
 
@@ -650,13 +769,10 @@ class TradingWorker(QThread):
                         atr = fm["atr_14"].iloc[-1] if "atr_14" in fm.columns else current_price * 0.001
                         last_atr[sym] = atr
 
-                        account_info = mt5.account_info()
-                        balance = account_info.balance if account_info else 10000
+                        point = points[sym]
 
-                        sym_info = mt5.symbol_info(sym)
-                        point = sym_info.point if sym_info else 0.0001
-
-                        # スプレッド取得（pips換算）
+                        # スプレッド取得（pips換算）— 現在値が必要なため毎回取得
+                        sym_info = symbol_info(sym)
                         # MT5の spread はポイント単位。1pip = 10ポイント（JPY系・USD系共通）
                         spread_pips = 0.0
                         if sym_info:
@@ -683,25 +799,23 @@ class TradingWorker(QThread):
                         current_hour_utc = datetime.utcnow().hour
 
                         # フィルター状態を計算してGUIに送信
-                        from fxbot.strategy.signal import get_filter_statuses
                         filter_statuses = get_filter_statuses(
                             sym, pred_val, current_price, atr,
-                            self.settings, confidence=confidence,
+                            settings, confidence=confidence,
                             spread_pips=spread_pips,
                             current_hour_utc=current_hour_utc,
                             regime=regime,
                             h4_regime=h4_regime,
                         )
                         filter_status_payload = [dataclasses.asdict(fs) for fs in filter_statuses]
-                        base_tf = self.settings.data.base_timeframe
                         ohlcv_df = data.get(base_tf, pd.DataFrame()).iloc[-100:].copy()
                         any_blocked = (
-                            self.settings.market_filter.enabled
+                            mf_cfg.enabled
                             and any(not fs.passed for fs in filter_statuses)
                         )
                         # UTC-aware ISO 文字列（df.index の tz-aware DatetimeIndex と型を合わせる）
                         hold_ts = datetime.now(timezone.utc).isoformat() if any_blocked else None
-                        self.signals.filter_update.emit({
+                        emit_filter_update({
                             "symbol": sym,
                             "filter_statuses": filter_status_payload,
                             "ohlcv_df": ohlcv_df,
@@ -710,7 +824,7 @@ class TradingWorker(QThread):
 
                         signal = generate_signal(
                             sym, pred_val, current_price, atr, balance, point,
-                            self.settings, confidence=confidence,
+                            settings, confidence=confidence,
                             spread_pips=spread_pips,
                             current_hour_utc=current_hour_utc,
                             regime=regime,
@@ -722,12 +836,13 @@ class TradingWorker(QThread):
 
                         position_allowed = True
                         order_attempted = False
+                        new_ticket: int | None = None
                         order_success = False
                         entered = False
                         skip_reason = signal.hold_reason or ""
 
                         if signal.action != SignalAction.HOLD:
-                            position_allowed = can_open_position(sym, self.settings)
+                            position_allowed = can_open_position(sym, settings, open_positions)
                             if model_degraded:
                                 skip_reason = "model_degraded"
                             elif not position_allowed:
@@ -740,8 +855,10 @@ class TradingWorker(QThread):
                                 if result:
                                     order_success = True
                                     entered = True
+                                    new_ticket = result.get("ticket")
+                                    open_positions.append({"ticket": new_ticket, "symbol": sym})
                                     skip_reason = ""
-                                    self.signals.progress.emit(
+                                    emit_progress(
                                         f"約定: {signal.action.value.upper()} {sym} "
                                         f"{signal.lot}lot @ {result['price']}"
                                     )
@@ -761,7 +878,6 @@ class TradingWorker(QThread):
 
                                     # 取引ログ記録
                                     if trade_logger:
-                                        from fxbot.trade_logger import TradeRecord
                                         record = TradeRecord(
                                             timestamp=_jst_now(),
                                             symbol=sym,
@@ -776,8 +892,8 @@ class TradingWorker(QThread):
                                             balance=balance,
                                             ticket=result.get("ticket"),
                                             model_version=meta.get("created_at", "unknown"),
-                                            profile_id=self.settings.active_profile_id or None,
-                                            snapshot_id=self.settings.active_snapshot_id or None,
+                                            profile_id=profile_id,
+                                            snapshot_id=snapshot_id,
                                             run_id=run_id or None,
                                         )
                                         db_row_id = trade_logger.log_entry(record)
@@ -813,21 +929,28 @@ class TradingWorker(QThread):
                                     "order_success": order_success,
                                     "entered": entered,
                                     "skip_reason": skip_reason,
-                                    "profile_id": self.settings.active_profile_id or None,
-                                    "snapshot_id": self.settings.active_snapshot_id or None,
+                                    "profile_id": profile_id,
+                                    "snapshot_id": snapshot_id,
                                     "run_id": run_id or None,
                                 },
                                 filter_status_payload,
                             )
 
                         # チケット集合更新（次バーのクローズ検出用）
-                        positions = get_open_positions()
-                        prev_tickets[sym] = {
-                            pos["ticket"] for pos in positions if pos["symbol"] == sym
-                        }
+                        # 周回頭のスナップショット + 今回約定分。スナップショット後に決済された
+                        # チケットも残るので、次周回のクローズ検出で取りこぼさない
+                        prev_tickets[sym] = set(open_tickets_by_sym.get(sym, ()))
+                        if new_ticket is not None:
+                            prev_tickets[sym].add(new_ticket)
+
+                        # 例外なく最後まで処理できたバーだけ処理済みにする（失敗時は次周回で再試行）
+                        last_bar_ts[sym] = bar_ts
 
                     except Exception as e:
-                        log.error(f"取引ループエラー ({sym}): {e}")
+                        # 約定済みなら再試行で二重発注しないよう処理済みにする
+                        if order_success:
+                            last_bar_ts[sym] = bar_ts
+                        log.exception(f"取引ループエラー ({sym}): {e}")
                         _n = _slack.get()
                         if _n:
                             _n.notify_error(f"取引ループエラー ({sym}): {e}")
@@ -837,7 +960,8 @@ class TradingWorker(QThread):
                     self.signals.prediction.emit(predictions_this_bar)
 
                 # ModelMonitorチェック（取引ログが有効な場合）
-                if model_monitor and self.settings.retraining.enabled:
+                if model_monitor and settings.retraining.enabled and monitor_dirty:
+                    monitor_dirty = False
                     result = model_monitor.check()
                     if not result["healthy"]:
                         m = result["metrics"]
@@ -847,7 +971,7 @@ class TradingWorker(QThread):
                             if _n:
                                 _n.notify_model_degraded(result["warnings"])
                         model_degraded = True
-                        self.signals.progress.emit(
+                        emit_progress(
                             f"[劣化停止中] 勝率={m.get('win_rate', 0):.1%} "
                             f"Sharpe={m.get('sharpe', 0):.2f} — 新規エントリー停止"
                         )
@@ -855,7 +979,7 @@ class TradingWorker(QThread):
                     else:
                         if model_degraded:
                             log.info("モデル性能回復: 新規エントリー再開")
-                            self.signals.progress.emit("モデル性能回復: 新規エントリー再開")
+                            emit_progress("モデル性能回復: 新規エントリー再開")
                         model_degraded = False
 
                 # トレーリングストップ更新（バー確定タイミング）
@@ -876,6 +1000,9 @@ class TradingWorker(QThread):
 
         except Exception as e:
             self.signals.error.emit(f"取引ワーカーエラー: {e}\n{traceback.format_exc()}")
+        finally:
+            if feature_pool is not None:
+                feature_pool.shutdown(wait=False, cancel_futures=True)
 
     def _update_trailing_stops(
         self, models: dict, last_atr: dict, trailing_activated: set, tp_triggered: set
@@ -886,6 +1013,11 @@ class TradingWorker(QThread):
         from fxbot.mt5.execution import modify_position, normalize_price
 
         risk_cfg = self.settings.risk
+        if not risk_cfg.trailing_sl_enabled:
+            return
+        activation_mult = risk_cfg.trailing_activation_atr
+        distance_mult = risk_cfg.trailing_atr_multiplier
+        trailing_tp_enabled = risk_cfg.trailing_tp_enabled
 
         positions = get_open_positions()  # ループ外で一度だけ取得
 
@@ -899,40 +1031,39 @@ class TradingWorker(QThread):
                         continue
 
                     # SL側トレーリング（TP連動）
-                    if risk_cfg.trailing_sl_enabled:
-                        stops = StopLevels(
-                            sl=pos["sl"], tp=pos["tp"],
-                            trailing_activation=atr * risk_cfg.trailing_activation_atr,
-                            trailing_distance=atr * risk_cfg.trailing_atr_multiplier,
-                        )
-                        new_sl = update_trailing_stop(
-                            pos["type"], pos["price_current"],
-                            pos["price_open"], pos["sl"], stops,
-                        )
-                        if new_sl is not None:
-                            new_sl_norm = normalize_price(sym, new_sl)
-                            old_sl_norm = normalize_price(sym, pos["sl"])
-                            if new_sl_norm == old_sl_norm:
-                                log.debug(f"トレーリングSL変化なし（正規化後同値）: {sym} ticket={pos['ticket']} sl={new_sl_norm}")
+                    stops = StopLevels(
+                        sl=pos["sl"], tp=pos["tp"],
+                        trailing_activation=atr * activation_mult,
+                        trailing_distance=atr * distance_mult,
+                    )
+                    new_sl = update_trailing_stop(
+                        pos["type"], pos["price_current"],
+                        pos["price_open"], pos["sl"], stops,
+                    )
+                    if new_sl is not None:
+                        new_sl_norm = normalize_price(sym, new_sl)
+                        old_sl_norm = normalize_price(sym, pos["sl"])
+                        if new_sl_norm == old_sl_norm:
+                            log.debug(f"トレーリングSL変化なし（正規化後同値）: {sym} ticket={pos['ticket']} sl={new_sl_norm}")
+                        else:
+                            # TP連動: SL移動量と同じだけTPも移動
+                            new_tp_norm = None
+                            if trailing_tp_enabled and pos["tp"] > 0:
+                                sl_shift = new_sl_norm - old_sl_norm
+                                new_tp_raw = pos["tp"] + sl_shift
+                                new_tp_norm = normalize_price(sym, new_tp_raw)
+
+                            ok = modify_position(
+                                pos["ticket"],
+                                sl=new_sl_norm,
+                                tp=new_tp_norm,
+                            )
+                            if ok:
+                                trailing_activated.add(pos["ticket"])
+                                tp_msg = f" new_tp={new_tp_norm}" if new_tp_norm is not None else ""
+                                log.info(f"トレーリングSL更新成功: {sym} ticket={pos['ticket']} new_sl={new_sl_norm}{tp_msg}")
                             else:
-                                # TP連動: SL移動量と同じだけTPも移動
-                                new_tp_norm = None
-                                if risk_cfg.trailing_tp_enabled and pos["tp"] > 0:
-                                    sl_shift = new_sl_norm - old_sl_norm
-                                    new_tp_raw = pos["tp"] + sl_shift
-                                    new_tp_norm = normalize_price(sym, new_tp_raw)
-
-                                ok = modify_position(
-                                    pos["ticket"],
-                                    sl=new_sl_norm,
-                                    tp=new_tp_norm,
-                                )
-                                if ok:
-                                    trailing_activated.add(pos["ticket"])
-                                    tp_msg = f" new_tp={new_tp_norm}" if new_tp_norm is not None else ""
-                                    log.info(f"トレーリングSL更新成功: {sym} ticket={pos['ticket']} new_sl={new_sl_norm}{tp_msg}")
-                                else:
-                                    log.warning(f"トレーリングSL更新失敗: {sym} ticket={pos['ticket']} new_sl={new_sl_norm}")
+                                log.warning(f"トレーリングSL更新失敗: {sym} ticket={pos['ticket']} new_sl={new_sl_norm}")
             except Exception as e:
                 log.error(f"トレーリング更新エラー ({sym}): {e}")
 
@@ -942,8 +1073,6 @@ class TradingWorker(QThread):
         """次のM5バー確定まで待機。trailing_update_interval秒ごとにトレーリングSLを更新."""
         import datetime as dt
 
-        interval = self.settings.risk.trailing_update_interval
-
         now = dt.datetime.now()
         minute = now.minute
         next_bar_minute = ((minute // 5) + 1) * 5
@@ -954,28 +1083,32 @@ class TradingWorker(QThread):
 
         wait_seconds = (next_bar - now).total_seconds()
         wait_seconds = max(10, min(310, wait_seconds))
-        total_wait = int(wait_seconds)
 
         log.debug(f"次バー待機: {wait_seconds:.0f}秒 (次バー: {next_bar.strftime('%H:%M:%S')})")
 
-        if interval and interval > 0:
-            elapsed = 0
-            while elapsed < total_wait and self._running:
-                chunk = min(interval, total_wait - elapsed)
-                for _ in range(chunk):
-                    if not self._running:
-                        break
-                    time.sleep(1)
-                elapsed += chunk
-                # 次バー到達前のみ更新
-                if elapsed < total_wait and self._running:
-                    log.debug(f"バー待機中トレーリング更新 (経過{elapsed}秒)")
-                    self._update_trailing_stops(models, last_atr, trailing_activated, tp_triggered)
-        else:
-            for _ in range(total_wait):
-                if not self._running:
-                    break
-                time.sleep(1)
+        self._sleep_with_trailing_updates(
+            int(wait_seconds), models, last_atr, trailing_activated, tp_triggered,
+        )
+
+    def _sleep_with_trailing_updates(
+        self, total_wait: int, models: dict, last_atr: dict,
+        trailing_activated: set, tp_triggered: set,
+    ) -> None:
+        """total_wait秒待機。trailing_update_interval秒ごとにトレーリングSLを更新."""
+        interval = self.settings.risk.trailing_update_interval
+        if not interval or interval <= 0:
+            self._sleep(total_wait)
+            return
+
+        elapsed = 0
+        while elapsed < total_wait and self._running:
+            chunk = min(interval, total_wait - elapsed)
+            self._sleep(chunk)
+            elapsed += chunk
+            # 待機終了前のみ更新
+            if elapsed < total_wait and self._running:
+                log.debug(f"待機中トレーリング更新 (経過{elapsed}秒)")
+                self._update_trailing_stops(models, last_atr, trailing_activated, tp_triggered)
 
     def _wait_for_next_bar(self) -> None:
         """次のM5バー確定タイミング（分の末尾が0/5）+ 5秒まで待機."""
@@ -994,10 +1127,21 @@ class TradingWorker(QThread):
         wait_seconds = max(10, min(310, wait_seconds))
 
         log.debug(f"次バー待機: {wait_seconds:.0f}秒 (次バー: {next_bar.strftime('%H:%M:%S')})")
-        for _ in range(int(wait_seconds)):
-            if not self._running:
-                break
-            time.sleep(1)
+        self._sleep(wait_seconds)
+
+    def _sleep(self, seconds: float) -> None:
+        """seconds秒待機。stop() が呼ばれたら即座に復帰."""
+        self._mutex.lock()
+        try:
+            if self._running:
+                self._cond.wait(self._mutex, int(seconds * 1000))
+        finally:
+            self._mutex.unlock()
 
     def stop(self):
-        self._running = False
+        self._mutex.lock()
+        try:
+            self._running = False
+            self._cond.wakeAll()
+        finally:
+            self._mutex.unlock()
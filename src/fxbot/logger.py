@@ -2,53 +2,106 @@
 
 from __future__ import annotations
 
+import atexit
+import copy
 import logging
+import queue
 import sys
-from logging.handlers import RotatingFileHandler
+import threading
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
 
 from fxbot.config import Settings
 
 _configured = False
+_configure_lock = threading.Lock()
+_listener: QueueListener | None = None
+
+
+class DeferredQueueHandler(QueueHandler):
+    """呼び出し元スレッドでは整形せず、レコードの浅いコピーをキューへ積むハンドラ.
+
+    整形時に asctime/message がレコードへ書き込まれるため、他ハンドラと
+    同一オブジェクトを共有しないようコピーを渡す。
+    """
+
+    def prepare(self, record):
+        return copy.copy(record)
 
 
 def setup_logger(settings: Settings) -> logging.Logger:
     """アプリケーションロガーを構成して返す."""
-    global _configured
+    global _configured, _listener
     logger = logging.getLogger("fxbot")
 
     if _configured:
         return logger
 
-    log_cfg = settings.logging
-    logger.setLevel(getattr(logging, log_cfg.level.upper(), logging.INFO))
-
-    fmt = logging.Formatter(
-        "%(asctime)s [%(levelname)-8s] %(name)s: %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S",
-    )
-
-    # コンソール出力
-    console = logging.StreamHandler(sys.stdout)
-    console.setFormatter(fmt)
-    logger.addHandler(console)
-
-    # ファイル出力
-    log_path = settings.resolve_path(log_cfg.file)
-    log_path.parent.mkdir(parents=True, exist_ok=True)
-    file_handler = RotatingFileHandler(
-        log_path,
-        maxBytes=log_cfg.max_bytes,
-        backupCount=log_cfg.backup_count,
-        encoding="utf-8",
-    )
-    file_handler.setFormatter(fmt)
-    logger.addHandler(file_handler)
-
-    _configured = True
+    # 複数スレッドから同時に呼ばれてもハンドラを二重登録しない
+    with _configure_lock:
+        if _configured:
+            return logger
+
+        log_cfg = settings.logging
+        logger.setLevel(getattr(logging, log_cfg.level.upper(), logging.INFO))
+
+        fmt = logging.Formatter(
+            "%(asctime)s [%(levelname)-8s] %(name)s: %(message)s",
+            datefmt="%Y-%m-%d %H:%M:%S",
+        )
+
+        # コンソール出力
+        console = logging.StreamHandler(sys.stdout)
+        console.setFormatter(fmt)
+
+        # ファイル出力
+        log_path = settings.resolve_path(log_cfg.file)
+        log_path.parent.mkdir(parents=True, exist_ok=True)
+        file_handler = RotatingFileHandler(
+            log_path,
+            maxBytes=log_cfg.max_bytes,
+            backupCount=log_cfg.backup_count,
+            encoding="utf-8",
+        )
+        file_handler.setFormatter(fmt)
+
+        # 出力（コンソール書込・ファイル書込/ローテーション）はリスナースレッドに任せ、
+        # 各スレッドの log 呼び出しはキュー投入だけにする
+        queue_handler = DeferredQueueHandler(queue.SimpleQueue())
+        listener = QueueListener(
+            queue_handler.queue, console, file_handler, respect_handler_level=True,
+        )
+        listener.start()
+        atexit.register(listener.stop)
+        logger.addHandler(queue_handler)
+        _listener = listener
+
+        _configured = True
+
     return logger
 
 
+def add_listener_handler(handler: logging.Handler) -> bool:
+    """setup_logger のリスナースレッドに出力先ハンドラを追加.
+
+    同じキュー・同じリスナーで処理するため、レコードを複数スレッドで共有しない。
+    ロガー未構成なら何もせず False を返す。
+    """
+    with _configure_lock:
+        if _listener is None:
+            return False
+        # リスナーは1レコードごとに handlers を読むので、タプルごと差し替える
+        _listener.handlers = (*_listener.handlers, handler)
+    return True
+
+
+def remove_listener_handler(handler: logging.Handler) -> None:
+    """add_listener_handler で追加したハンドラを外す."""
+    with _configure_lock:
+        if _listener is not None:
+            _listener.handlers = tuple(h for h in _listener.handlers if h is not handler)
+
+
 def get_logger(name: str = "fxbot") -> logging.Logger:
     """子ロガーを取得."""
     return logging.getLogger(name)
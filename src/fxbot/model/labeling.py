@@ -13,6 +13,97 @@ from fxbot.logger import get_logger
 
 log = get_logger(__name__)
 
+try:
+    from numba import njit, prange
+    _HAS_NUMBA = True
+except ImportError:  # numba 未導入時はNumPyベクトル化版を使う
+    _HAS_NUMBA = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        return lambda fn: fn
+
+# ラベル未定義（ボラ未確定・末尾行）を表す int8 の番兵値
+_NO_LABEL = -128
+# ベクトル化版で一度に処理するアンカー行数
+_BLOCK_ROWS = 4096
+
+
+@njit("int8[:](float64[:], float64[:], float64[:], boolean[:], int64)", cache=True, parallel=True)
+def _triple_barrier_loop(
+    close: np.ndarray,
+    tp_barrier: np.ndarray,
+    sl_barrier: np.ndarray,
+    valid: np.ndarray,
+    horizon: int,
+) -> np.ndarray:
+    """前方走査でTP/SLの先着を判定（無効行は _NO_LABEL）.
+
+    各アンカーは labels[i] にしか書かないので、外側ループはスレッド並列化できる。
+    """
+    n = len(close)
+    labels = np.full(n, _NO_LABEL, dtype=np.int8)
+
+    for i in prange(n - 1):
+        if not valid[i]:
+            continue
+        tp = tp_barrier[i]
+        sl = sl_barrier[i]
+        end_idx = min(i + horizon + 1, n)
+        label = 0  # デフォルト: vertical barrier（どちらにもヒットせず）
+
+        for j in range(i + 1, end_idx):
+            if close[j] >= tp:
+                label = 1
+                break
+            elif close[j] <= sl:
+                label = -1
+                break
+
+        labels[i] = label
+
+    return labels
+
+
+def _triple_barrier_vectorized(
+    close: np.ndarray,
+    tp_barrier: np.ndarray,
+    sl_barrier: np.ndarray,
+    valid: np.ndarray,
+    horizon: int,
+) -> np.ndarray:
+    """_triple_barrier_loop と同じ結果を前方窓ビューの一括比較で求める."""
+    from numpy.lib.stride_tricks import sliding_window_view
+
+    n = len(close)
+    labels = np.full(n, _NO_LABEL, dtype=np.int8)
+    rows = np.flatnonzero(valid[: n - 1])
+    if rows.size == 0:
+        return labels
+
+    # 末尾は NaN で埋めて窓長を揃える（NaN との比較は常に False = ヒットなし）
+    padded = np.concatenate([close, np.full(horizon, np.nan)])
+    all_windows = sliding_window_view(padded, horizon + 1)
+
+    # 比較用の一時配列がキャッシュに収まるよう、アンカー行をブロック単位で処理
+    for start in range(0, rows.size, _BLOCK_ROWS):
+        block = rows[start:start + _BLOCK_ROWS]
+        windows = all_windows[block, 1:]
+
+        with np.errstate(invalid="ignore"):
+            tp_hit = windows >= tp_barrier[block, None]
+            sl_hit = windows <= sl_barrier[block, None]
+
+        first_tp = np.where(tp_hit.any(axis=1), tp_hit.argmax(axis=1), horizon)
+        first_sl = np.where(sl_hit.any(axis=1), sl_hit.argmax(axis=1), horizon)
+
+        # TP先着=1, SL先着=-1, どちらもなし=0
+        labels[block] = np.sign(first_sl - first_tp)
+    return labels
+
+
+_triple_barrier = _triple_barrier_loop if _HAS_NUMBA else _triple_barrier_vectorized
+
 
 def compute_triple_barrier_labels(
     df: pd.DataFrame,
@@ -31,10 +122,10 @@ def compute_triple_barrier_labels(
         vol_lookback: ローリング標準偏差のルックバック期間
 
     Returns:
-        ラベルSeries: 1 (TP hit / up), -1 (SL hit / down), 0 (vertical barrier / no hit)
+        ラベルSeries（Int8）: 1 (TP hit / up), -1 (SL hit / down), 0 (vertical barrier / no hit)、
+        ラベル未定義の行は <NA>
     """
-    close = df["close"].values
-    n = len(close)
+    close = df["close"].to_numpy(dtype=np.float64, copy=True)
 
     # ローリング標準偏差（対数リターン）をバリア幅として使用
     log_returns = np.log(close[1:] / close[:-1])
@@ -42,29 +133,17 @@ def compute_triple_barrier_labels(
     # 先頭にNaNが入るので、1つずらしてcloseと同じ長さにする
     vol = np.concatenate([[np.nan], vol])
 
-    labels = np.full(n, np.nan)
-
-    for i in range(n - 1):
-        if np.isnan(vol[i]) or vol[i] <= 0:
-            continue
-
-        tp_barrier = close[i] * np.exp(vol[i] * tp_mult)
-        sl_barrier = close[i] * np.exp(-vol[i] * sl_mult)
+    # バリア価格と有効行マスクはループ外で一括計算（NaN との比較は False なので無効扱い）
+    with np.errstate(invalid="ignore"):
+        valid = vol > 0
+    tp_barrier = close * np.exp(vol * tp_mult)
+    sl_barrier = close * np.exp(-vol * sl_mult)
 
-        end_idx = min(i + horizon + 1, n)
-        label = 0  # デフォルト: vertical barrier（どちらにもヒットせず）
-
-        for j in range(i + 1, end_idx):
-            if close[j] >= tp_barrier:
-                label = 1
-                break
-            elif close[j] <= sl_barrier:
-                label = -1
-                break
-
-        labels[i] = label
+    labels = _triple_barrier(close, tp_barrier, sl_barrier, valid, horizon)
 
-    result = pd.Series(labels, index=df.index, name="label")
+    result = pd.Series(
+        pd.arrays.IntegerArray(labels, labels == _NO_LABEL), index=df.index, name="label",
+    )
     valid = result.notna()
     counts = result[valid].value_counts()
     log.info(f"Triple Barrier ラベル分布: {counts.to_dict()} "
@@ -22,6 +22,9 @@ class ModelMonitor:
         self.window = window
         self.min_win_rate = min_win_rate
         self.min_sharpe = min_sharpe
+        # クローズ件数が変わらなければ前回の判定結果を再利用
+        self._last_count = -1
+        self._last_result: dict | None = None
 
     def check(self) -> dict:
         """モデルの健全性をチェック.
@@ -33,6 +36,16 @@ class ModelMonitor:
                 "metrics": dict,
             }
         """
+        closed_count = self.trade_logger.get_closed_count()
+        if closed_count == self._last_count and self._last_result is not None:
+            return self._last_result
+
+        result = self._evaluate()
+        self._last_count = closed_count
+        self._last_result = result
+        return result
+
+    def _evaluate(self) -> dict:
         metrics = self.trade_logger.get_rolling_metrics(self.window)
         warnings = []
 
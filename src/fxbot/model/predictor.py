@@ -20,6 +20,53 @@ class Predictor:
         self.model = model
         self.feature_names = feature_names
         self.mode = mode
+        # 1行推論は OpenMP の並列化コストの方が大きいので単一スレッドで実行
+        self._latest_params = {"num_threads": 1, "predict_disable_shape_check": True}
+        # 列位置インデックス（列構成が変わらない限り再計算しない）と最新バー用1行バッファ
+        self._cached_columns: pd.Index | None = None
+        self._cols_idx: np.ndarray | None = None
+        self._feat_buf = np.empty((1, len(feature_names)), dtype=np.float64)
+
+    @classmethod
+    def from_meta(
+        cls, model: lgb.Booster, meta: dict, default_mode: str = "regression"
+    ) -> Predictor:
+        """メタデータのモードに応じた専用サブクラスを生成.
+
+        モードは meta["mode"] → meta["metrics"]["mode"] → default_mode の順で決定する。
+        """
+        mode = meta.get("mode") or meta.get("metrics", {}).get("mode", default_mode)
+        if mode == "classification":
+            return ClassificationPredictor(model, meta["feature_names"])
+        return RegressionPredictor(model, meta["feature_names"])
+
+    def predict_latest_for_trade(
+        self, feature_matrix: pd.DataFrame, min_threshold: float
+    ) -> tuple[float, float]:
+        """最新バーの (売買判定用予測値, 信頼度) を返す.
+
+        self.mode で回帰/分類を切り替える。from_meta で生成したサブクラスは
+        モード分岐なしの専用パスで上書きする。
+        """
+        if self.mode == "classification":
+            return self._classification_for_trade(feature_matrix)
+        return self._regression_for_trade(feature_matrix, min_threshold)
+
+    def _regression_for_trade(
+        self, feature_matrix: pd.DataFrame, min_threshold: float
+    ) -> tuple[float, float]:
+        """回帰: (予測対数リターン, 予測強度ベースの信頼度)."""
+        X = self._latest_row(feature_matrix)
+        pred_val = float(self.predict_array(X, **self._latest_params)[0])
+        # 予測強度を信頼度代替として計算（threshold の3倍で confidence=1.0 になるよう正規化）
+        confidence = min(abs(pred_val) / max(min_threshold * 3.0, 1e-10), 1.0)
+        return pred_val, confidence
+
+    def _classification_for_trade(self, feature_matrix: pd.DataFrame) -> tuple[float, float]:
+        """分類: (方向 × 信頼度, 信頼度)."""
+        direction, confidence = self.predict_latest_with_confidence(feature_matrix)
+        # 方向 × 信頼度を予測値として使用
+        return float(direction) * confidence, confidence
 
     def predict(self, feature_matrix: pd.DataFrame) -> pd.Series:
         """特徴量マトリクスから予測値を計算.
@@ -28,8 +75,7 @@ class Predictor:
             回帰: 予測対数リターンのSeries
             分類: 予測クラス(0=down, 1=neutral, 2=up)のSeries
         """
-        X = feature_matrix[self.feature_names]
-        preds = self.model.predict(X)
+        preds = self.predict_array(self._to_array(feature_matrix))
         if self.mode == "classification":
             # (n_samples, 3) → argmax でクラス予測
             preds = np.argmax(preds, axis=1)
@@ -41,20 +87,54 @@ class Predictor:
         Returns:
             DataFrame with columns: prob_down, prob_neutral, prob_up
         """
-        X = feature_matrix[self.feature_names]
-        preds = self.model.predict(X)
         if self.mode != "classification":
             raise ValueError("predict_proba() は分類モデルでのみ使用可能")
+        preds = self.predict_array(self._to_array(feature_matrix))
         return pd.DataFrame(
             preds,
             index=feature_matrix.index,
             columns=["prob_down", "prob_neutral", "prob_up"],
         )
 
+    def predict_array(self, X: np.ndarray, **predict_params) -> np.ndarray:
+        """feature_names 順に並んだ ndarray からモデルの生出力を返す."""
+        return self.model.predict(X, **predict_params)
+
+    def _column_indexer(self, columns: pd.Index) -> np.ndarray:
+        """feature_names の列位置を返す（同じ列構成ならキャッシュを再利用）."""
+        if self._cols_idx is not None and (
+            columns is self._cached_columns or columns.equals(self._cached_columns)
+        ):
+            return self._cols_idx
+        idx = columns.get_indexer(self.feature_names)
+        if (idx < 0).any():
+            missing = [c for c, i in zip(self.feature_names, idx) if i < 0]
+            raise KeyError(f"特徴量が不足: {missing}")
+        self._cols_idx = idx.astype(np.intp)
+        self._cached_columns = columns
+        return self._cols_idx
+
+    def _to_array(self, feature_matrix: pd.DataFrame) -> np.ndarray:
+        """feature_names 順の ndarray を位置指定で切り出す."""
+        idx = self._column_indexer(feature_matrix.columns)
+        return np.ascontiguousarray(
+            feature_matrix.iloc[:, idx].to_numpy(dtype=np.float64, na_value=np.nan)
+        )
+
+    def _latest_row(self, feature_matrix: pd.DataFrame) -> np.ndarray:
+        """最新バーの特徴量を再利用バッファへ詰めて返す."""
+        idx = self._column_indexer(feature_matrix.columns)
+        row = feature_matrix.iloc[-1].to_numpy(dtype=np.float64, na_value=np.nan)
+        np.take(row, idx, out=self._feat_buf[0])
+        return self._feat_buf
+
     def predict_latest(self, feature_matrix: pd.DataFrame) -> float:
         """最新バーの予測値を返す（回帰モデル用）."""
-        preds = self.predict(feature_matrix)
-        return float(preds.iloc[-1])
+        X = self._latest_row(feature_matrix)
+        preds = self.predict_array(X, **self._latest_params)
+        if self.mode == "classification":
+            return float(np.argmax(preds, axis=1)[0])
+        return float(preds[0])
 
     def predict_latest_with_confidence(
         self, feature_matrix: pd.DataFrame
@@ -65,10 +145,10 @@ class Predictor:
             (direction, confidence): direction は 1(up) or -1(down),
             confidence は max(prob_up, prob_down)
         """
-        proba = self.predict_proba(feature_matrix)
-        latest = proba.iloc[-1]
-        prob_up = latest["prob_up"]
-        prob_down = latest["prob_down"]
+        if self.mode != "classification":
+            raise ValueError("predict_proba() は分類モデルでのみ使用可能")
+        X = self._latest_row(feature_matrix)
+        prob_down, _, prob_up = self.predict_array(X, **self._latest_params)[0]
         direction = 1 if prob_up > prob_down else -1
         confidence = max(prob_up, prob_down)
         return direction, float(confidence)
@@ -77,21 +157,43 @@ class Predictor:
         self, feature_matrix: pd.DataFrame
     ) -> pd.DataFrame:
         """予測値と信頼度指標を返す（後方互換）."""
+        X = self._to_array(feature_matrix)
+        raw = self.predict_array(X)
         if self.mode == "classification":
-            proba = self.predict_proba(feature_matrix)
-            direction = np.where(
-                proba["prob_up"] > proba["prob_down"], 1, -1
-            )
-            confidence = np.maximum(proba["prob_up"], proba["prob_down"])
+            # 確率は1回だけ推論し、クラス予測も同じ結果から導く
+            prob_down, prob_up = raw[:, 0], raw[:, 2]
             return pd.DataFrame({
-                "prediction": self.predict(feature_matrix),
-                "confidence": confidence,
-                "direction": direction,
+                "prediction": np.argmax(raw, axis=1),
+                "confidence": np.maximum(prob_up, prob_down),
+                "direction": np.where(prob_up > prob_down, 1, -1),
             }, index=feature_matrix.index)
         else:
-            preds = self.predict(feature_matrix)
             return pd.DataFrame({
-                "prediction": preds,
-                "abs_prediction": preds.abs(),
-                "direction": np.sign(preds),
+                "prediction": raw,
+                "abs_prediction": np.abs(raw),
+                "direction": np.sign(raw),
             }, index=feature_matrix.index)
+
+
+class RegressionPredictor(Predictor):
+    """回帰モデル専用の Predictor."""
+
+    def __init__(self, model: lgb.Booster, feature_names: list[str]):
+        super().__init__(model, feature_names, mode="regression")
+
+    def predict_latest_for_trade(
+        self, feature_matrix: pd.DataFrame, min_threshold: float
+    ) -> tuple[float, float]:
+        return self._regression_for_trade(feature_matrix, min_threshold)
+
+
+class ClassificationPredictor(Predictor):
+    """分類モデル（Triple Barrier 3クラス）専用の Predictor."""
+
+    def __init__(self, model: lgb.Booster, feature_names: list[str]):
+        super().__init__(model, feature_names, mode="classification")
+
+    def predict_latest_for_trade(
+        self, feature_matrix: pd.DataFrame, min_threshold: float
+    ) -> tuple[float, float]:
+        return self._classification_for_trade(feature_matrix)
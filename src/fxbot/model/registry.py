@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import json
+import os
 from datetime import datetime
 from pathlib import Path
 
@@ -86,16 +87,54 @@ def find_latest_model(symbol: str, timeframe: str, settings: Settings) -> Path |
     return None
 
 
-def list_models(settings: Settings) -> list[dict]:
-    """保存済みモデルの一覧を返す."""
+def list_models(
+    settings: Settings,
+    timeframe: str | None = None,
+    latest_per_symbol: bool = False,
+) -> list[dict]:
+    """保存済みモデルの一覧を返す（新しい順）.
+
+    Args:
+        settings: 設定
+        timeframe: 指定時はこの時間足のモデルのみ返す
+        latest_per_symbol: True ならシンボルごとに最新の1件のみ返す
+
+    ディレクトリ名 ``{symbol}_{timeframe}_{YYYYmmdd}_{HHMMSS}`` で事前に絞り込み、
+    対象外のメタデータJSONは読み込まない。
+    """
     base = settings.resolve_path(settings.model.model_dir)
     if not base.exists():
         return []
 
+    # os.scandir はディレクトリ判定にエントリ取得時の情報を使うため、
+    # glob のような候補ごとの stat を発行しない
+    with os.scandir(base) as it:
+        dir_names = sorted((e.name for e in it if e.is_dir()), reverse=True)
+
     models = []
-    for meta_path in sorted(base.glob("*/metadata.json"), reverse=True):
-        with open(meta_path, "r", encoding="utf-8") as f:
-            meta = json.load(f)
+    seen_symbols: set[str] = set()
+    for dir_name in dir_names:
+        parts = dir_name.rsplit("_", 3)
+        if len(parts) == 4:
+            dir_symbol, dir_tf = parts[0], parts[1]
+            if timeframe is not None and dir_tf != timeframe:
+                continue
+            if latest_per_symbol and dir_symbol in seen_symbols:
+                continue
+
+        meta_path = base / dir_name / "metadata.json"
+        try:
+            with open(meta_path, "rb") as f:
+                meta = json.load(f)
+        except FileNotFoundError:
+            continue
+        if timeframe is not None and meta.get("timeframe") != timeframe:
+            continue
+        symbol = meta.get("symbol", "")
+        if latest_per_symbol:
+            if symbol in seen_symbols:
+                continue
+            seen_symbols.add(symbol)
         meta["path"] = str(meta_path.parent)
         models.append(meta)
     return models
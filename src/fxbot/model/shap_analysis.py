@@ -5,13 +5,19 @@ from __future__ import annotations
 import lightgbm as lgb
 import numpy as np
 import pandas as pd
-import shap
 
 from fxbot.logger import get_logger
 
 log = get_logger(__name__)
 
 
+def _subsample(X: pd.DataFrame, max_samples: int) -> pd.DataFrame:
+    """サンプル数が多い場合はサブサンプリング."""
+    if len(X) > max_samples:
+        return X.sample(max_samples, random_state=42)
+    return X
+
+
 def compute_shap_values(
     model: lgb.Booster,
     X: pd.DataFrame,
@@ -22,17 +28,24 @@ def compute_shap_values(
     Returns:
         (shap_values, expected_value) のタプル
     """
-    # サンプル数が多い場合はサブサンプリング
-    if len(X) > max_samples:
-        X_sample = X.sample(max_samples, random_state=42)
+    X_sample = _subsample(X, max_samples)
+
+    # LightGBM 組込みの TreeSHAP（C++・マルチスレッド）で計算。
+    # shap.TreeExplainer（tree_path_dependent）と同じ値になる
+    n_features = X_sample.shape[1]
+    contrib = model.predict(X_sample, pred_contrib=True)
+    n_outputs = contrib.shape[1] // (n_features + 1)
+    if n_outputs > 1:
+        # 多クラス: (n_samples, n_classes*(n_features+1)) → (n_classes, n_samples, n_features)
+        contrib = contrib.reshape(len(X_sample), n_outputs, n_features + 1).transpose(1, 0, 2)
+        shap_values = contrib[:, :, :-1]
+        expected_value = contrib[:, 0, -1]
     else:
-        X_sample = X
+        shap_values = contrib[:, :-1]
+        expected_value = contrib[0, -1]
 
-    explainer = shap.TreeExplainer(model)
-    shap_values = explainer.shap_values(X_sample)
-
-    log.info(f"SHAP計算完了: {X_sample.shape[0]}サンプル × {X_sample.shape[1]}特徴量")
-    return shap_values, explainer.expected_value
+    log.info(f"SHAP計算完了: {X_sample.shape[0]}サンプル × {n_features}特徴量")
+    return shap_values, expected_value
 
 
 def compute_feature_importance(
@@ -56,6 +69,43 @@ def compute_feature_importance(
     else:
         # 回帰: shape (n_samples, n_features)
         importance = np.abs(sv).mean(axis=0)
+    return _importance_frame(importance, feature_names)
+
+
+def compute_mean_abs_shap(
+    model: lgb.Booster,
+    X: pd.DataFrame,
+    max_samples: int = 5000,
+    chunk: int = 512,
+) -> pd.DataFrame:
+    """チャンク単位でSHAP値を計算し、mean(|SHAP|)を逐次集計する.
+
+    compute_shap_values + compute_feature_importance と同じ結果を返すが、
+    SHAP行列全体を保持しないためピークメモリは chunk × 特徴量数 に収まる。
+
+    Returns:
+        feature, importance列を持つDataFrame（重要度降順）
+    """
+    X_sample = _subsample(X, max_samples)
+    n_samples, n_features = X_sample.shape
+    values = X_sample.to_numpy()
+
+    acc = np.zeros(n_features)
+    n_outputs = 1
+    for start in range(0, n_samples, chunk):
+        contrib = model.predict(values[start:start + chunk], pred_contrib=True)
+        n_outputs = contrib.shape[1] // (n_features + 1)
+        # (rows, n_outputs, n_features+1) として bias 列を除き、サンプル軸・クラス軸で合計
+        contrib = contrib.reshape(len(contrib), n_outputs, n_features + 1)
+        acc += np.abs(contrib[:, :, :-1]).sum(axis=(0, 1))
+
+    importance = acc / max(n_samples * n_outputs, 1)
+    log.info(f"SHAP計算完了: {n_samples}サンプル × {n_features}特徴量（chunk={chunk}）")
+    return _importance_frame(importance, list(X.columns))
+
+
+def _importance_frame(importance: np.ndarray, feature_names: list[str]) -> pd.DataFrame:
+    """重要度配列を降順・累積比率付きのDataFrameに整形."""
     df = pd.DataFrame({
         "feature": feature_names,
         "importance": importance,
@@ -82,8 +132,7 @@ def select_features(
     Returns:
         (selected_feature_names, importance_df) のタプル
     """
-    shap_values, _ = compute_shap_values(model, X, max_samples)
-    importance_df = compute_feature_importance(shap_values, list(X.columns))
+    importance_df = compute_mean_abs_shap(model, X, max_samples)
 
     n_select = max(1, int(len(importance_df) * top_pct))
     selected = importance_df.head(n_select)["feature"].tolist()
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import math
 from datetime import datetime
 from pathlib import Path
 
@@ -24,10 +25,12 @@ def build_target(df: pd.DataFrame, horizon: int = 6) -> pd.Series:
 
     y = log(close[t+horizon] / close[t])
     """
-    close = df["close"]
-    target = np.log(close.shift(-horizon) / close)
-    target.name = "target"
-    return target
+    # log(close) を1回だけ計算し、horizon 先との差を取る（末尾 horizon 本は NaN）
+    log_close = np.log(df["close"].to_numpy(dtype=np.float64))
+    target = np.full_like(log_close, np.nan)
+    n = max(len(log_close) - horizon, 0)
+    np.subtract(log_close[horizon:horizon + n], log_close[:n], out=target[:n])
+    return pd.Series(target, index=df.index, name="target")
 
 
 def build_target_classification(
@@ -87,7 +90,9 @@ def prepare_dataset(
     y = target.copy()
 
     # NaN除去（ターゲットのshift分）
-    valid_mask = y.notna() & X.notna().all(axis=1)
+    # (n, m) の bool 配列を1回だけ作り、行方向に縮約する
+    values = X.to_numpy(dtype=np.float64, na_value=np.nan)
+    valid_mask = ~(np.isnan(values).any(axis=1) | y.isna().to_numpy())
     X = X[valid_mask]
     y = y[valid_mask]
 
@@ -101,10 +106,17 @@ def _make_time_weights(n: int, decay: float = 0.9995) -> np.ndarray:
     最古サンプルを基準1.0として、最新は (1/decay)^n 倍重くなる。
     decayが大きいほど均一に近い（0.9995で約50%前のデータは約22%の重み）。
     """
-    indices = np.arange(n)
-    weights = decay ** (n - 1 - indices)  # 最新 → weight=1.0, 古い → 小さい
-    weights = weights / weights.mean()     # 平均1に正規化
-    return weights.astype(np.float32)
+    # decay^k = exp(k·log(decay)) を float32 の1配列上で計算（最新 → weight=1.0, 古い → 小さい）
+    weights = np.arange(n - 1, -1, -1, dtype=np.float32)
+    weights *= math.log(decay)
+    np.exp(weights, out=weights)
+    weights /= weights.mean(dtype=np.float64)  # 平均1に正規化
+    return weights
+
+
+def _to_float32(X: pd.DataFrame) -> np.ndarray:
+    """特徴量を C 連続の float32 配列に変換（NA は NaN）."""
+    return np.ascontiguousarray(X.to_numpy(dtype=np.float32, na_value=np.nan))
 
 
 def train_model(
@@ -154,8 +166,16 @@ def train_model(
         params["metric"] = "multi_logloss"
         params["is_unbalance"] = True  # クラス不均衡対策（NEUTRAL多数時）
 
-    train_data = lgb.Dataset(X_train, label=y_train, weight=train_weights)
-    val_data = lgb.Dataset(X_val, label=y_val, reference=train_data)
+    # DataFrame の列ごとの受け渡しを避け、連続した float32 配列で Dataset を構築
+    feature_names = list(X.columns)
+    train_data = lgb.Dataset(
+        _to_float32(X_train), label=y_train.to_numpy(dtype=np.float32),
+        weight=train_weights, feature_name=feature_names,
+    )
+    val_data = lgb.Dataset(
+        _to_float32(X_val), label=y_val.to_numpy(dtype=np.float32),
+        feature_name=feature_names, reference=train_data,
+    )
 
     callbacks = [
         lgb.early_stopping(cfg.early_stopping_rounds),
@@ -190,9 +210,14 @@ def _calc_regression_metrics(
     model: lgb.Booster, X_val: pd.DataFrame, y_val: pd.Series, X: pd.DataFrame
 ) -> dict:
     y_pred_val = model.predict(X_val)
-    mae = np.mean(np.abs(y_val - y_pred_val))
-    direction_acc = np.mean(np.sign(y_val) == np.sign(y_pred_val))
-    ic = np.corrcoef(y_val, y_pred_val)[0, 1]
+    y_true = y_val.to_numpy(dtype=np.float64)
+    mae = np.mean(np.abs(y_true - y_pred_val))
+    direction_acc = np.mean(np.sign(y_true) == np.sign(y_pred_val))
+    # Pearson相関（2×N のスタックを作らず、中心化した内積で直接計算）
+    yt = y_true - y_true.mean()
+    yp = y_pred_val - y_pred_val.mean()
+    denom = np.sqrt((yt @ yt) * (yp @ yp))
+    ic = (yt @ yp) / denom if denom > 0 else np.nan
 
     log.info(f"学習完了: MAE={mae:.6f}, 方向精度={direction_acc:.4f}, IC={ic:.4f}")
     return {
@@ -212,20 +237,20 @@ def _calc_classification_metrics(
 
     accuracy = np.mean(y_pred_class == y_true)
 
-    # Per-class precision/recall
-    per_class = {}
-    class_names = {0: "down", 1: "neutral", 2: "up"}
-    for cls in range(3):
-        pred_mask = y_pred_class == cls
-        true_mask = y_true == cls
-        tp = np.sum(pred_mask & true_mask)
-        precision = tp / pred_mask.sum() if pred_mask.sum() > 0 else 0.0
-        recall = tp / true_mask.sum() if true_mask.sum() > 0 else 0.0
-        per_class[class_names[cls]] = {
-            "precision": float(precision),
-            "recall": float(recall),
-            "support": int(true_mask.sum()),
+    # Per-class precision/recall（3×3 混同行列から一括算出: 行=正解, 列=予測）
+    cm = np.bincount(y_true * 3 + y_pred_class, minlength=9).reshape(3, 3)
+    tp = np.diag(cm)
+    support = cm.sum(axis=1)
+    precision = tp / np.maximum(cm.sum(axis=0), 1)
+    recall = tp / np.maximum(support, 1)
+    per_class = {
+        name: {
+            "precision": float(precision[cls]),
+            "recall": float(recall[cls]),
+            "support": int(support[cls]),
         }
+        for cls, name in enumerate(("down", "neutral", "up"))
+    }
 
     # 方向精度（up vs down のみ。neutralは除外）
     dir_mask = (y_true != 1)  # neutral以外
@@ -1,7 +1,8 @@
-"""OHLCV取得・parquetキャッシュ."""
+"""OHLCV取得・Feather(Arrow IPC)キャッシュ."""
 
 from __future__ import annotations
 
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
 
@@ -31,33 +32,35 @@ def fetch_ohlcv(
         log.warning(f"データ取得失敗: {symbol} {timeframe} — {mt5.last_error()}")
         return pd.DataFrame()
 
-    df = pd.DataFrame(rates)
-    df["time"] = pd.to_datetime(df["time"], unit="s", utc=True)
-    df = df.rename(columns={
-        "time": "datetime",
-        "open": "open",
-        "high": "high",
-        "low": "low",
-        "close": "close",
-        "tick_volume": "volume",
-        "spread": "spread",
-        "real_volume": "real_volume",
-    })
-    df = df.set_index("datetime")
-    return df
+    # 構造化配列のフィールドを型付き配列として直接列に割り当てる
+    # （time は int64 秒なので datetime64[s] への view 変換で済む）
+    index = pd.DatetimeIndex(rates["time"].view("datetime64[s]"), name="datetime")
+    index = index.tz_localize("UTC")
+    return pd.DataFrame({
+        "open": rates["open"],
+        "high": rates["high"],
+        "low": rates["low"],
+        "close": rates["close"],
+        "volume": rates["tick_volume"],
+        "spread": rates["spread"],
+        "real_volume": rates["real_volume"],
+    }, index=index)
 
 
 def _cache_path(symbol: str, timeframe: str, settings: Settings) -> Path:
     """キャッシュファイルのパスを生成."""
     cache_dir = settings.resolve_path(settings.data.cache_dir)
     cache_dir.mkdir(parents=True, exist_ok=True)
-    return cache_dir / f"{symbol}_{timeframe}.parquet"
+    return cache_dir / f"{symbol}_{timeframe}.feather"
 
 
 def save_ohlcv(df: pd.DataFrame, symbol: str, timeframe: str, settings: Settings) -> Path:
-    """OHLCVをparquetに保存."""
+    """OHLCVをFeather(LZ4圧縮)に保存.
+
+    毎回全体を書き直すため、デコード・書込みの軽い Arrow IPC 形式を使う。
+    """
     path = _cache_path(symbol, timeframe, settings)
-    df.to_parquet(path, engine="pyarrow")
+    df.to_feather(path, compression="lz4")
     log.info(f"OHLCV保存: {path} ({len(df)}行)")
     return path
 
@@ -65,13 +68,41 @@ def save_ohlcv(df: pd.DataFrame, symbol: str, timeframe: str, settings: Settings
 def load_ohlcv(symbol: str, timeframe: str, settings: Settings) -> pd.DataFrame:
     """キャッシュからOHLCVを読み込む."""
     path = _cache_path(symbol, timeframe, settings)
-    if not path.exists():
+    if path.exists():
+        df = pd.read_feather(path)
+    elif path.with_suffix(".parquet").exists():
+        # 旧形式キャッシュ（次回保存時に Feather へ置き換わる）
+        df = pd.read_parquet(path.with_suffix(".parquet"), engine="pyarrow", memory_map=True)
+    else:
         return pd.DataFrame()
-    df = pd.read_parquet(path, engine="pyarrow")
     log.debug(f"OHLCVキャッシュ読込: {path} ({len(df)}行)")
     return df
 
 
+def _merge_with_cache(
+    fresh: pd.DataFrame,
+    symbol: str,
+    timeframe: str,
+    settings: Settings,
+) -> pd.DataFrame:
+    """取得済みOHLCVを既存キャッシュとマージして保存（MT5を呼ばないのでスレッド実行可）."""
+    cached = load_ohlcv(symbol, timeframe, settings)
+
+    if fresh.empty:
+        return cached
+
+    if not cached.empty:
+        # 既存データとマージ: キャッシュは時刻昇順なので fresh 先頭より前の行だけを
+        # 二分探索で切り出して連結する（重複は fresh 側を優先）
+        cut = cached.index.searchsorted(fresh.index[0], side="left")
+        df = pd.concat([cached.iloc[:cut], fresh])
+    else:
+        df = fresh
+
+    save_ohlcv(df, symbol, timeframe, settings)
+    return df
+
+
 def fetch_and_cache(
     symbol: str,
     timeframe: str,
@@ -85,42 +116,59 @@ def fetch_and_cache(
     if bars is None:
         bars = settings.data.bars_count
 
-    cached = load_ohlcv(symbol, timeframe, settings)
     fresh = fetch_ohlcv(symbol, timeframe, bars)
+    return _merge_with_cache(fresh, symbol, timeframe, settings)
 
-    if fresh.empty:
-        return cached
 
-    if not cached.empty:
-        # 既存データとマージ（重複排除）
-        df = pd.concat([cached, fresh])
-        df = df[~df.index.duplicated(keep="last")]
-        df = df.sort_index()
-    else:
-        df = fresh
+def _fetch_pooled(
+    requests: list[tuple[str, str, int]],
+    settings: Settings,
+    max_workers: int = 4,
+) -> dict[tuple[str, str], pd.DataFrame]:
+    """(symbol, timeframe, bars) の一覧を取得し、キャッシュとマージして返す.
 
-    save_ohlcv(df, symbol, timeframe, settings)
-    return df
+    MT5 はスレッドセーフでないため copy_rates は呼び出しスレッドで直列に行い、
+    キャッシュの読込・マージ・保存だけをスレッドプールで次の取得と重ねる。
+    """
+    jobs: dict[tuple[str, str], Future] = {}
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ohlcv-cache") as pool:
+        for symbol, tf, bars in requests:
+            log.info(f"取得中: {symbol} {tf} ({bars}バー)")
+            fresh = fetch_ohlcv(symbol, tf, bars)
+            jobs[(symbol, tf)] = pool.submit(_merge_with_cache, fresh, symbol, tf, settings)
+    return {key: job.result() for key, job in jobs.items()}
 
 
-def fetch_multi_timeframe(
-    symbol: str,
+def fetch_multi_symbol(
+    symbols: list[str],
     settings: Settings,
-) -> dict[str, pd.DataFrame]:
-    """基準足 + 上位足のOHLCVをまとめて取得."""
+    max_workers: int = 4,
+) -> dict[str, dict[str, pd.DataFrame]]:
+    """複数シンボルの基準足 + 上位足をまとめて取得."""
     timeframes = [settings.data.base_timeframe] + settings.data.higher_timeframes
-    result = {}
-    for tf in timeframes:
-        log.info(f"取得中: {symbol} {tf}")
-        df = fetch_and_cache(symbol, tf, settings)
+    bars = settings.data.bars_count
+    frames = _fetch_pooled(
+        [(symbol, tf, bars) for symbol in symbols for tf in timeframes], settings, max_workers,
+    )
+
+    result: dict[str, dict[str, pd.DataFrame]] = {symbol: {} for symbol in symbols}
+    for (symbol, tf), df in frames.items():
         if not df.empty:
-            result[tf] = df
-            log.info(f"  → {len(df)}行")
+            result[symbol][tf] = df
+            log.info(f"  {symbol} {tf} → {len(df)}行")
         else:
-            log.warning(f"  → データなし")
+            log.warning(f"  {symbol} {tf} → データなし")
     return result
 
 
+def fetch_multi_timeframe(
+    symbol: str,
+    settings: Settings,
+) -> dict[str, pd.DataFrame]:
+    """基準足 + 上位足のOHLCVをまとめて取得."""
+    return fetch_multi_symbol([symbol], settings)[symbol]
+
+
 _BARS_PER_DAY: dict[str, float] = {
     "M1": 1440, "M5": 288, "M15": 96, "M30": 48,
     "H1": 24, "H4": 6, "D1": 1, "W1": 0.2,
@@ -144,11 +192,12 @@ def fetch_for_wfo(symbol: str, settings: Settings) -> dict[str, pd.DataFrame]:
         + 30
     )
     timeframes = [settings.data.base_timeframe] + settings.data.higher_timeframes
+    log.info(f"WFO用データ取得: {symbol} {timeframes} ({days_needed}日分)")
+    frames = _fetch_pooled(
+        [(symbol, tf, days_to_bars(tf, days_needed)) for tf in timeframes], settings,
+    )
     result = {}
-    for tf in timeframes:
-        bars = days_to_bars(tf, days_needed)
-        log.info(f"WFO用データ取得: {symbol} {tf} {bars}バー ({days_needed}日分)")
-        df = fetch_and_cache(symbol, tf, settings, bars=bars)
+    for (_, tf), df in frames.items():
         if not df.empty:
             result[tf] = df
         else:
@@ -2,12 +2,31 @@
 
 from __future__ import annotations
 
+import time
+
 import MetaTrader5 as mt5
 
 from fxbot.logger import get_logger
 
 log = get_logger(__name__)
 
+# symbol_info は約定方式・ティックサイズ等ほぼ不変の情報なので短時間キャッシュし、
+# トレーリングや一括決済で同じシンボルへの IPC を繰り返さない
+_SYMBOL_INFO_TTL = 1.0  # 秒
+_symbol_info_cache: dict[str, tuple[float, object]] = {}
+
+
+def _symbol_info(symbol: str):
+    """TTL付きキャッシュ経由で mt5.symbol_info を取得（取得失敗はキャッシュしない）."""
+    now = time.monotonic()
+    cached = _symbol_info_cache.get(symbol)
+    if cached is not None and now - cached[0] < _SYMBOL_INFO_TTL:
+        return cached[1]
+    info = mt5.symbol_info(symbol)
+    if info is not None:
+        _symbol_info_cache[symbol] = (now, info)
+    return info
+
 
 def normalize_price(symbol: str, price: float) -> float:
     """MT5のティックサイズに合わせて価格を正規化する.
@@ -15,7 +34,7 @@ def normalize_price(symbol: str, price: float) -> float:
     float精度のまま送信するとMT5が内部正規化した結果が現在値と同値になり
     retcode=10025 (No changes) が返るのを防ぐ。
     """
-    info = mt5.symbol_info(symbol)
+    info = _symbol_info(symbol)
     if info is None:
         return round(price, 5)
     tick_size = info.trade_tick_size
@@ -48,7 +67,7 @@ def send_order(
     Returns:
         約定結果の辞書、失敗時はNone
     """
-    symbol_info = mt5.symbol_info(symbol)
+    symbol_info = _symbol_info(symbol)
     if symbol_info is None:
         log.error(f"シンボル情報取得失敗: {symbol}")
         return None
@@ -147,15 +166,19 @@ def close_position(ticket: int) -> bool:
     if not position:
         log.error(f"ポジション取得失敗: ticket={ticket}")
         return False
+    return _close(position[0], mt5.symbol_info_tick(position[0].symbol))
 
-    pos = position[0]
-    symbol_info = mt5.symbol_info(pos.symbol)
+
+def _close(pos, tick) -> bool:
+    """取得済みのポジション・ティックで反対売買を送信."""
+    ticket = pos.ticket
+    symbol_info = _symbol_info(pos.symbol)
     if pos.type == mt5.ORDER_TYPE_BUY:
         order_type = mt5.ORDER_TYPE_SELL
-        price = mt5.symbol_info_tick(pos.symbol).bid
+        price = tick.bid
     else:
         order_type = mt5.ORDER_TYPE_BUY
-        price = mt5.symbol_info_tick(pos.symbol).ask
+        price = tick.ask
 
     filling_type = _get_filling_type(symbol_info) if symbol_info else mt5.ORDER_FILLING_IOC
     request = {
@@ -193,7 +216,6 @@ def get_deal_history(position_ticket: int) -> dict | None:
     Returns:
         決済情報の辞書 {price, profit, time, reason}、取得失敗時はNone
     """
-    import time
     from datetime import datetime, timedelta, timezone
     from zoneinfo import ZoneInfo
 
@@ -277,9 +299,12 @@ def close_all_positions() -> int:
     if not positions:
         return 0
 
+    # ティックはシンボルごとに1回だけ取得し、同一シンボルの決済で使い回す
+    ticks = {sym: mt5.symbol_info_tick(sym) for sym in {pos.symbol for pos in positions}}
+
     closed = 0
     for pos in positions:
-        if close_position(pos.ticket):
+        if _close(pos, ticks[pos.symbol]):
             closed += 1
 
     log.info(f"全決済: {closed}/{len(positions)}")
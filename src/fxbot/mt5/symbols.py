@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import json
+from operator import attrgetter
 from pathlib import Path
 
 import MetaTrader5 as mt5
@@ -14,6 +15,16 @@ log = get_logger(__name__)
 
 SYMBOLS_FILE = "data/symbols.json"
 
+# load_symbols のキャッシュ: path -> (mtime, symbols)
+_symbols_cache: dict[Path, tuple[float, list[dict]]] = {}
+
+# 保存するシンボル属性（1回の attrgetter 呼び出しでまとめて取り出す）
+_SYMBOL_FIELDS = (
+    "name", "description", "digits", "point", "trade_contract_size",
+    "volume_min", "volume_max", "volume_step", "spread",
+)
+_get_fields = attrgetter(*_SYMBOL_FIELDS)
+
 
 def detect_symbols(settings: Settings) -> list[dict]:
     """MT5から取引可能なFXペアを検出."""
@@ -22,28 +33,13 @@ def detect_symbols(settings: Settings) -> list[dict]:
         log.error(f"シンボル取得失敗: {mt5.last_error()}")
         return []
 
-    fx_symbols = []
-    for s in all_symbols:
-        # FXペア: trade_modeがFULL、かつ通貨ペアっぽいもの
-        if s.trade_mode != mt5.SYMBOL_TRADE_MODE_FULL:
-            continue
-        # path に "Forex" を含む or calc_mode が FOREX
-        is_forex = (
-            "Forex" in (s.path or "")
-            or s.trade_calc_mode == 0  # SYMBOL_CALC_MODE_FOREX
-        )
-        if is_forex:
-            fx_symbols.append({
-                "name": s.name,
-                "description": s.description,
-                "digits": s.digits,
-                "point": s.point,
-                "trade_contract_size": s.trade_contract_size,
-                "volume_min": s.volume_min,
-                "volume_max": s.volume_max,
-                "volume_step": s.volume_step,
-                "spread": s.spread,
-            })
+    # FXペア: trade_modeがFULL、かつ path に "Forex" を含む or calc_mode が FOREX(0)
+    full = mt5.SYMBOL_TRADE_MODE_FULL
+    fx_symbols = [
+        dict(zip(_SYMBOL_FIELDS, _get_fields(s)))
+        for s in all_symbols
+        if s.trade_mode == full and (s.trade_calc_mode == 0 or "Forex" in (s.path or ""))
+    ]
 
     log.info(f"FXペア検出: {len(fx_symbols)}ペア")
     return fx_symbols
@@ -53,19 +49,34 @@ def save_symbols(symbols: list[dict], settings: Settings) -> Path:
     """シンボル情報をJSONに保存."""
     path = settings.resolve_path(SYMBOLS_FILE)
     path.parent.mkdir(parents=True, exist_ok=True)
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(symbols, f, indent=2, ensure_ascii=False)
+    # json.dump はチャンクごとに write するため、文字列へ一括エンコードしてから1回で書き込む
+    path.write_bytes(json.dumps(symbols, indent=2, ensure_ascii=False).encode("utf-8"))
+    clear_symbol_cache()
     log.info(f"シンボル情報保存: {path} ({len(symbols)}ペア)")
     return path
 
 
 def load_symbols(settings: Settings) -> list[dict]:
-    """保存済みシンボル情報を読み込む."""
+    """保存済みシンボル情報を読み込む（ファイル更新時刻が変わるまでキャッシュ）."""
     path = settings.resolve_path(SYMBOLS_FILE)
-    if not path.exists():
+    try:
+        mtime = path.stat().st_mtime
+    except FileNotFoundError:
+        _symbols_cache.pop(path, None)
         return []
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+
+    cached = _symbols_cache.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    symbols = json.loads(path.read_bytes())
+    _symbols_cache[path] = (mtime, symbols)
+    return symbols
+
+
+def clear_symbol_cache() -> None:
+    """load_symbols のキャッシュを破棄."""
+    _symbols_cache.clear()
 
 
 def get_symbol_names(settings: Settings) -> list[str]:
@@ -32,9 +32,18 @@ def get_open_positions() -> list[dict]:
     ]
 
 
-def can_open_position(symbol: str, settings: Settings) -> bool:
-    """新しいポジションを建てられるか判定."""
-    positions = get_open_positions()
+def can_open_position(
+    symbol: str,
+    settings: Settings,
+    positions: list[dict] | None = None,
+) -> bool:
+    """新しいポジションを建てられるか判定.
+
+    positions を渡すとそのスナップショットで判定し、MT5 への問い合わせを省く
+    （判定に使うのは "symbol" キーのみ）。
+    """
+    if positions is None:
+        positions = get_open_positions()
 
     # 全体ポジション数チェック
     if len(positions) >= settings.trading.max_positions:
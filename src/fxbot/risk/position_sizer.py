@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-import numpy as np
+import math
 
 from fxbot.config import Settings
 from fxbot.logger import get_logger
@@ -10,6 +10,13 @@ from fxbot.logger import get_logger
 log = get_logger(__name__)
 
 
+def _kelly_fraction(win_prob: float, win_loss_ratio: float) -> float:
+    """ケリー基準の最適投資比率 f* = p - (1-p)/b（エッジなしは0）."""
+    if win_loss_ratio <= 0:
+        return 0.0
+    return max(0.0, win_prob - (1.0 - win_prob) / win_loss_ratio)
+
+
 def calculate_lot(
     prediction: float,
     balance: float,
@@ -17,6 +24,7 @@ def calculate_lot(
     point: float,
     settings: Settings,
     confidence: float = 1.0,
+    win_prob: float | None = None,
 ) -> float:
     """予測値・残高・ATRからロットサイズを計算.
 
@@ -27,9 +35,23 @@ def calculate_lot(
     4. 予測値の大きさで調整（大きいほどロット増）
     5. 信頼度でスケーリング（分類モデル使用時）
 
+    win_prob 指定時は 1・3〜5 の代わりにフラクショナル・ケリーでリスク率を決める
+    （ペイオフ比 = atr_tp_multiplier / atr_sl_multiplier、上限 max_risk_per_trade）。
+
     Args:
         confidence: 分類モデルの信頼度 (0.0〜1.0)。デフォルト1.0で後方互換。
+        win_prob: 勝率の推定値 (0.0〜1.0)。None/NaNなら従来のATRベース計算。
+
+    Raises:
+        ValueError: win_prob が 0.0〜1.0 の範囲外
     """
+    if win_prob is not None:
+        if math.isnan(win_prob):
+            log.warning("win_prob が NaN のためATRベースのロット計算にフォールバック")
+            win_prob = None
+        elif not 0.0 <= win_prob <= 1.0:
+            raise ValueError(f"win_prob は 0.0〜1.0 で指定: {win_prob}")
+
     risk_cfg = settings.risk
     trading_cfg = settings.trading
 
@@ -38,7 +60,7 @@ def calculate_lot(
     risk_amount = balance * risk_cfg.max_risk_per_trade / max_pos
     sl_distance = atr * risk_cfg.atr_sl_multiplier
 
-    if sl_distance <= 0 or np.isnan(sl_distance):
+    if sl_distance <= 0 or math.isnan(sl_distance):
         return trading_cfg.min_lot
 
     # 標準ロット: 100,000通貨 = 1ロット
@@ -50,19 +72,29 @@ def calculate_lot(
     if pred_abs <= threshold:
         return 0.0  # 閾値未満は取引しない
 
-    # 予測値が閾値の2倍 → ×1.5、3倍 → ×1.8 (対数スケール)
-    scale = 1.0 + 0.5 * np.log1p(pred_abs / threshold - 1)
-    scale = min(scale, 2.0)  # 最大2倍
-
-    # 信頼度でロットスケーリング（高信頼度 → フルサイズ、低信頼度 → 縮小）
-    lot = base_lot * scale * confidence
+    if win_prob is not None:
+        # フラクショナル・ケリー: 勝率に応じたリスク率（エッジなしなら取引しない）
+        payoff = risk_cfg.atr_tp_multiplier / risk_cfg.atr_sl_multiplier
+        kelly = _kelly_fraction(win_prob, payoff) * trading_cfg.kelly_multiplier
+        if kelly <= 0:
+            return 0.0
+        risk_pct = min(kelly, risk_cfg.max_risk_per_trade)
+        lot = balance * risk_pct / max_pos / (sl_distance * 100_000)
+    else:
+        # 予測値が閾値の2倍 → ×1.5、3倍 → ×1.8 (対数スケール)
+        scale = 1.0 + 0.5 * math.log1p(pred_abs / threshold - 1)
+        scale = min(scale, 2.0)  # 最大2倍
+
+        # 信頼度でロットスケーリング（高信頼度 → フルサイズ、低信頼度 → 縮小）
+        lot = base_lot * scale * confidence
 
     # 残高連動 max_lot（設定有効時は残高に応じた動的上限を適用）
     effective_max_lot = trading_cfg.max_lot
     if trading_cfg.max_lot_balance_pct > 0:
         dynamic = balance * trading_cfg.max_lot_balance_pct / 100_000
         effective_max_lot = max(trading_cfg.min_lot, min(trading_cfg.max_lot, dynamic))
-        log.debug(f"残高連動max_lot: balance={balance:.0f} → dynamic={dynamic:.4f} effective={effective_max_lot:.4f}")
+        log.debug("残高連動max_lot: balance=%.0f → dynamic=%.4f effective=%.4f",
+                  balance, dynamic, effective_max_lot)
 
     lot = max(trading_cfg.min_lot, min(effective_max_lot, lot))
     lot = round(lot, 2)
@@ -4,15 +4,13 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 
-import numpy as np
-
 from fxbot.config import Settings
 from fxbot.logger import get_logger
 
 log = get_logger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class StopLevels:
     sl: float
     tp: float
@@ -20,6 +18,11 @@ class StopLevels:
     trailing_distance: float
 
 
+def _side_sign(side: str) -> float:
+    """売買方向の符号（buy=+1.0, それ以外=-1.0）."""
+    return 1.0 if side == "buy" else -1.0
+
+
 def calculate_stops(
     side: str,
     entry_price: float,
@@ -53,16 +56,12 @@ def calculate_stops(
     trailing_activation = atr * risk_cfg.trailing_activation_atr
     trailing_distance = atr * risk_cfg.trailing_atr_multiplier
 
-    if side == "buy":
-        sl = entry_price - adjusted_sl
-        tp = entry_price + adjusted_tp
-    else:
-        sl = entry_price + adjusted_sl
-        tp = entry_price - adjusted_tp
+    # buy=+1 / sell=-1 の符号で方向を表し、分岐なしで計算
+    s = _side_sign(side)
 
     return StopLevels(
-        sl=sl,
-        tp=tp,
+        sl=entry_price - s * adjusted_sl,
+        tp=entry_price + s * adjusted_tp,
         trailing_activation=trailing_activation,
         trailing_distance=trailing_distance,
     )
@@ -80,17 +79,11 @@ def update_trailing_stop(
     Returns:
         新しいSL値、更新不要ならNone
     """
-    if side == "buy":
-        profit = current_price - entry_price
-        if profit >= stop_levels.trailing_activation:
-            new_sl = current_price - stop_levels.trailing_distance
-            if new_sl > current_sl:
-                return new_sl
-    else:
-        profit = entry_price - current_price
-        if profit >= stop_levels.trailing_activation:
-            new_sl = current_price + stop_levels.trailing_distance
-            if new_sl < current_sl:
-                return new_sl
+    s = _side_sign(side)
+    profit = s * (current_price - entry_price)
+    if profit >= stop_levels.trailing_activation:
+        new_sl = current_price - s * stop_levels.trailing_distance
+        if s * (new_sl - current_sl) > 0:
+            return new_sl
 
     return None
@@ -7,9 +7,19 @@ from enum import Enum
 
 from fxbot.config import Settings
 from fxbot.logger import get_logger
+from fxbot.risk.position_sizer import calculate_lot
+from fxbot.risk.stop_manager import calculate_stops
 
 log = get_logger(__name__)
 
+# UTC時 → ロンドン(7-16)/NY(13-22)いずれかのセッション内か（時刻ごとの事前計算表）
+_SESSION_OK = tuple((7 <= h < 16) or (13 <= h < 22) for h in range(24))
+
+
+def in_trading_session(hour_utc: int) -> bool:
+    """UTC時がロンドンまたはNYセッション内か."""
+    return _SESSION_OK[hour_utc]
+
 
 class SignalAction(str, Enum):
     BUY = "buy"
@@ -17,7 +27,7 @@ class SignalAction(str, Enum):
     HOLD = "hold"
 
 
-@dataclass
+@dataclass(slots=True)
 class TradeSignal:
     symbol: str
     action: SignalAction
@@ -247,9 +257,6 @@ def generate_signal(
         current_hour_utc: 現在時刻（UTC時）。Noneで時刻フィルタ無効。
         regime: 現在の市場レジーム ("trend_up"|"trend_down"|"ranging")。
     """
-    from fxbot.risk.position_sizer import calculate_lot
-    from fxbot.risk.stop_manager import calculate_stops
-
     threshold = settings.trading.min_prediction_threshold
     min_confidence = settings.trading.min_confidence
 
@@ -258,44 +265,43 @@ def generate_signal(
     if mf.enabled:
         # ADXフィルター（レンジ相場）
         if mf.use_adx_filter and regime == "ranging":
-            log.debug(f"レンジ相場でHOLD: {symbol} regime={regime}")
+            log.debug("レンジ相場でHOLD: %s regime=%s", symbol, regime)
             return _make_hold(symbol, prediction, "adx_ranging")
 
         # スプレッドフィルター
         if mf.use_spread_filter and spread_pips is not None and spread_pips > mf.max_spread_pips:
-            log.debug(f"スプレッド過大でHOLD: {symbol} spread={spread_pips:.1f}pips > {mf.max_spread_pips}")
+            log.debug("スプレッド過大でHOLD: %s spread=%.1fpips > %s",
+                      symbol, spread_pips, mf.max_spread_pips)
             return _make_hold(symbol, prediction, "spread_over")
 
         # ボラティリティフィルター（個別スイッチで制御）
         if mf.use_volatility_filter and current_price > 0 and atr > 0:
             atr_pct = atr / current_price * 100
             if atr_pct < mf.min_atr_pct:
-                log.debug(f"低ボラでHOLD: {symbol} ATR%={atr_pct:.4f}% < {mf.min_atr_pct}%")
+                log.debug("低ボラでHOLD: %s ATR%%=%.4f%% < %s%%", symbol, atr_pct, mf.min_atr_pct)
                 return _make_hold(symbol, prediction, "volatility_low")
             if atr_pct > mf.max_atr_pct:
-                log.debug(f"過大ボラでHOLD: {symbol} ATR%={atr_pct:.4f}% > {mf.max_atr_pct}%")
+                log.debug("過大ボラでHOLD: %s ATR%%=%.4f%% > %s%%", symbol, atr_pct, mf.max_atr_pct)
                 return _make_hold(symbol, prediction, "volatility_high")
 
         # セッションフィルター（ロンドン7-16 UTC, NY13-22 UTC）
         if mf.session_only and current_hour_utc is not None:
-            in_london = 7 <= current_hour_utc < 16
-            in_ny = 13 <= current_hour_utc < 22
-            if not (in_london or in_ny):
-                log.debug(f"セッション外でHOLD: {symbol} UTC={current_hour_utc}時")
+            if not _SESSION_OK[current_hour_utc]:
+                log.debug("セッション外でHOLD: %s UTC=%s時", symbol, current_hour_utc)
                 return _make_hold(symbol, prediction, "session_outside")
 
         # H4トレンドフィルター
         if mf.use_h4_trend_filter and h4_regime != "ranging":
             if h4_regime == "trend_up" and prediction < 0:
-                log.debug(f"H4上昇トレンド中にSELLブロック: {symbol} h4_regime={h4_regime}")
+                log.debug("H4上昇トレンド中にSELLブロック: %s h4_regime=%s", symbol, h4_regime)
                 return _make_hold(symbol, prediction, "h4_trend_conflict")
             elif h4_regime == "trend_down" and prediction > 0:
-                log.debug(f"H4下降トレンド中にBUYブロック: {symbol} h4_regime={h4_regime}")
+                log.debug("H4下降トレンド中にBUYブロック: %s h4_regime=%s", symbol, h4_regime)
                 return _make_hold(symbol, prediction, "h4_trend_conflict")
 
     # --- 信頼度チェック（classificationモードのみ）---
     if settings.model.mode == "classification" and confidence < min_confidence:
-        log.debug(f"信頼度不足でHOLD: {symbol} confidence={confidence:.4f} < {min_confidence}")
+        log.debug("信頼度不足でHOLD: %s confidence=%.4f < %s", symbol, confidence, min_confidence)
         return _make_hold(symbol, prediction, "confidence_low")
 
     # --- 予測値閾値チェック ---
@@ -321,7 +327,8 @@ def generate_signal(
         trailing_distance=stops.trailing_distance,
     )
 
-    log.debug(f"シグナル生成: {signal.action.value.upper()} {symbol} "
-              f"pred={prediction:.6f} conf={confidence:.4f} lot={lot} "
-              f"SL={stops.sl:.5f} TP={stops.tp:.5f} regime={regime} h4={h4_regime}")
+    # バックテストでは毎バー通るため、DEBUG無効時に整形コストを払わない遅延フォーマット
+    log.debug("シグナル生成: %s %s pred=%.6f conf=%.4f lot=%s SL=%.5f TP=%.5f regime=%s h4=%s",
+              signal.action.value.upper(), symbol, prediction, confidence, lot,
+              stops.sl, stops.tp, regime, h4_regime)
     return signal
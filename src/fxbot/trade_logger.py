@@ -4,8 +4,10 @@ from __future__ import annotations
 
 import csv
 import json
+import math
 import sqlite3
-from dataclasses import asdict, dataclass
+from dataclasses import dataclass, fields
+from operator import attrgetter
 from pathlib import Path
 from typing import Optional
 
@@ -79,6 +81,10 @@ CREATE TABLE IF NOT EXISTS analysis_filter_events (
 
 _CREATE_INDEXES = [
     "CREATE INDEX IF NOT EXISTS idx_trades_symbol_timestamp ON trades(symbol, timestamp)",
+    # log_exit の WHERE ticket=? 用
+    "CREATE INDEX IF NOT EXISTS idx_trades_ticket ON trades(ticket)",
+    # クローズ済み取引の件数・直近N件（ModelMonitor）用の部分インデックス
+    "CREATE INDEX IF NOT EXISTS idx_trades_closed_id ON trades(id DESC) WHERE pnl IS NOT NULL",
     "CREATE INDEX IF NOT EXISTS idx_analysis_events_symbol_timestamp ON analysis_events(symbol, timestamp)",
     "CREATE INDEX IF NOT EXISTS idx_analysis_filter_events_symbol_name ON analysis_filter_events(symbol, filter_name)",
 ]
@@ -93,7 +99,7 @@ _ALTER_MIGRATIONS = [
 ]
 
 
-@dataclass
+@dataclass(slots=True)
 class TradeRecord:
     timestamp: str
     symbol: str
@@ -117,6 +123,15 @@ class TradeRecord:
     run_id: Optional[str] = None
 
 
+# log_entry 用: INSERT 文と列値の取り出しはレコード型から一度だけ組み立てる
+_TRADE_FIELDS = tuple(f.name for f in fields(TradeRecord))
+_INSERT_TRADE = (
+    f"INSERT INTO trades ({', '.join(_TRADE_FIELDS)}) "
+    f"VALUES ({', '.join(['?'] * len(_TRADE_FIELDS))})"
+)
+_trade_values = attrgetter(*_TRADE_FIELDS)
+
+
 class TradeLogger:
     """SQLiteベースの取引ログ管理."""
 
@@ -125,6 +140,10 @@ class TradeLogger:
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         self._conn = sqlite3.connect(str(self.db_path))
         self._conn.row_factory = sqlite3.Row
+        # WAL: 取引ループの書込みとGUIタブの読込みが互いにブロックせず、
+        # commit ごとの fsync もチェックポイント時にまとめられる
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
         self._conn.execute(_CREATE_TABLE)
         self._conn.execute(_CREATE_ANALYSIS_EVENTS_TABLE)
         self._conn.execute(_CREATE_ANALYSIS_FILTERS_TABLE)
@@ -159,13 +178,7 @@ class TradeLogger:
 
     def log_entry(self, record: TradeRecord) -> int:
         """エントリーを記録し、レコードIDを返す."""
-        data = asdict(record)
-        cols = ", ".join(data.keys())
-        placeholders = ", ".join(["?"] * len(data))
-        cursor = self._conn.execute(
-            f"INSERT INTO trades ({cols}) VALUES ({placeholders})",
-            list(data.values()),
-        )
+        cursor = self._conn.execute(_INSERT_TRADE, _trade_values(record))
         self._conn.commit()
         row_id = cursor.lastrowid
         log.info(f"取引記録[entry]: id={row_id} {record.direction} {record.symbol} "
@@ -297,32 +310,45 @@ class TradeLogger:
         )
         return [dict(row) for row in cursor.fetchall()]
 
+    def get_closed_count(self) -> int:
+        """クローズ済み（pnl記録済み）取引の件数を返す."""
+        row = self._conn.execute(
+            "SELECT COUNT(*) FROM trades WHERE pnl IS NOT NULL"
+        ).fetchone()
+        return int(row[0])
+
     def get_rolling_metrics(self, window: int = 20) -> dict:
         """直近window件のクローズ済み取引からローリングメトリクスを計算."""
-        cursor = self._conn.execute(
-            "SELECT pnl FROM trades WHERE pnl IS NOT NULL ORDER BY id DESC LIMIT ?",
+        # 件数・平均・合計・勝ち数・分散（母分散, 平均からの2パス）を1クエリで集計
+        row = self._conn.execute(
+            """
+            WITH w AS (
+                SELECT pnl FROM trades WHERE pnl IS NOT NULL ORDER BY id DESC LIMIT ?
+            ),
+            s AS (
+                SELECT COUNT(*) AS n, AVG(pnl) AS mean, SUM(pnl) AS total,
+                       SUM(pnl > 0) AS wins
+                FROM w
+            )
+            SELECT s.n, s.mean, s.total, s.wins,
+                   (SELECT AVG((w.pnl - s.mean) * (w.pnl - s.mean)) FROM w) AS var
+            FROM s
+            """,
             (window,),
-        )
-        rows = cursor.fetchall()
-        if not rows:
+        ).fetchone()
+        count = row["n"]
+        if not count:
             return {"count": 0, "win_rate": 0.0, "avg_pnl": 0.0, "sharpe": 0.0}
 
-        pnls = [row["pnl"] for row in rows]
-        count = len(pnls)
-        wins = sum(1 for p in pnls if p > 0)
-        win_rate = wins / count if count > 0 else 0.0
-        avg_pnl = sum(pnls) / count
-
-        import numpy as np
-        pnl_arr = np.array(pnls)
-        std = pnl_arr.std()
-        sharpe = (pnl_arr.mean() / std) if std > 0 else 0.0
+        avg_pnl = row["mean"]
+        std = math.sqrt(row["var"])
+        sharpe = (avg_pnl / std) if std > 0 else 0.0
 
         return {
             "count": count,
-            "win_rate": win_rate,
+            "win_rate": row["wins"] / count,
             "avg_pnl": avg_pnl,
-            "total_pnl": sum(pnls),
+            "total_pnl": row["total"],
             "sharpe": sharpe,
         }
 
@@ -649,20 +675,23 @@ class TradeLogger:
 
     def export_csv(self, path: str | Path) -> None:
         """全取引をCSVにエクスポート."""
+        # fetchall せずカーソルから直接書き出す（メモリ一定・1MBバッファ）
         cursor = self._conn.execute("SELECT * FROM trades ORDER BY id")
-        rows = cursor.fetchall()
-        if not rows:
+        first = cursor.fetchone()
+        if first is None:
             log.warning("エクスポート対象の取引がありません")
             return
 
         out_path = Path(path)
         out_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(out_path, "w", newline="", encoding="utf-8") as f:
+        with open(out_path, "w", newline="", encoding="utf-8", buffering=1 << 20) as f:
             writer = csv.writer(f)
-            writer.writerow(rows[0].keys())
-            for row in rows:
-                writer.writerow(tuple(row))
-        log.info(f"取引ログCSVエクスポート: {out_path} ({len(rows)}件)")
+            writer.writerow(first.keys())
+            writer.writerow(first)
+            count = 1
+            for count, row in enumerate(cursor, start=2):
+                writer.writerow(row)
+        log.info(f"取引ログCSVエクスポート: {out_path} ({count}件)")
 
     def close(self) -> None:
         self._conn.close()
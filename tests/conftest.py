@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import copy
+
 import numpy as np
 import pandas as pd
 import pytest
@@ -9,24 +11,31 @@ import pytest
 from fxbot.config import Settings, load_settings
 
 
-@pytest.fixture
-def settings() -> Settings:
-    """テスト用設定."""
+@pytest.fixture(scope="session")
+def _settings_base() -> Settings:
+    """設定本体（YAML/.env 読込はセッションで1回だけ）."""
     return load_settings()
 
 
 @pytest.fixture
-def sample_ohlcv() -> pd.DataFrame:
-    """テスト用OHLCVデータ（500行）."""
-    np.random.seed(42)
+def settings(_settings_base) -> Settings:
+    """テスト用設定. テスト内で書き換えても他に漏れないようコピーを返す."""
+    return copy.deepcopy(_settings_base)
+
+
+@pytest.fixture(scope="session")
+def _sample_ohlcv_base() -> pd.DataFrame:
+    """OHLCVデータ本体（セッションで1回だけ生成）."""
+    rng = np.random.default_rng(42)
     n = 500
     dates = pd.date_range("2024-01-01", periods=n, freq="5min", tz="UTC")
 
-    close = 1.1000 + np.cumsum(np.random.randn(n) * 0.0002)
-    high = close + np.abs(np.random.randn(n) * 0.0003)
-    low = close - np.abs(np.random.randn(n) * 0.0003)
-    open_ = close + np.random.randn(n) * 0.0001
-    volume = np.random.randint(100, 10000, n).astype(float)
+    noise = rng.standard_normal((n, 4))
+    close = 1.1000 + np.cumsum(noise[:, 0] * 0.0002)
+    high = close + np.abs(noise[:, 1] * 0.0003)
+    low = close - np.abs(noise[:, 2] * 0.0003)
+    open_ = close + noise[:, 3] * 0.0001
+    volume = rng.integers(100, 10000, n).astype(float)
 
     df = pd.DataFrame({
         "open": open_,
@@ -42,9 +51,15 @@ def sample_ohlcv() -> pd.DataFrame:
 
 
 @pytest.fixture
-def sample_multi_tf(sample_ohlcv) -> dict[str, pd.DataFrame]:
-    """マルチTFテストデータ."""
-    m5 = sample_ohlcv.copy()
+def sample_ohlcv(_sample_ohlcv_base) -> pd.DataFrame:
+    """テスト用OHLCVデータ（500行）. テスト間で共有しないようコピーを返す."""
+    return _sample_ohlcv_base.copy()
+
+
+@pytest.fixture(scope="session")
+def _sample_multi_tf_base(_sample_ohlcv_base) -> dict[str, pd.DataFrame]:
+    """マルチTFデータ本体（リサンプルはセッションで1回だけ）."""
+    m5 = _sample_ohlcv_base.copy()
 
     # M15を模擬（3行ごとにリサンプル）
     m15 = m5.resample("15min").agg({
@@ -69,3 +84,9 @@ def sample_multi_tf(sample_ohlcv) -> dict[str, pd.DataFrame]:
     }).dropna()
 
     return {"M5": m5, "M15": m15, "H1": h1}
+
+
+@pytest.fixture
+def sample_multi_tf(_sample_multi_tf_base) -> dict[str, pd.DataFrame]:
+    """マルチTFテストデータ. テスト間で共有しないようコピーを返す."""
+    return {tf: df.copy() for tf, df in _sample_multi_tf_base.items()}
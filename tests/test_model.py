@@ -56,3 +56,109 @@ class TestTraining:
 
         latest = predictor.predict_latest(X)
         assert isinstance(latest, float)
+
+
+class TestRegistry:
+    @staticmethod
+    def _write_meta(base, symbol, timeframe, timestamp):
+        import json
+        d = base / f"{symbol}_{timeframe}_{timestamp}"
+        d.mkdir(parents=True)
+        (d / "metadata.json").write_text(
+            json.dumps({"symbol": symbol, "timeframe": timeframe}), encoding="utf-8",
+        )
+
+    def test_list_models_latest_per_symbol(self, settings, tmp_path):
+        from fxbot.model.registry import list_models
+
+        settings.model.model_dir = str(tmp_path)
+        self._write_meta(tmp_path, "USDJPY", "M5", "20240101_000000")
+        self._write_meta(tmp_path, "USDJPY", "M5", "20240201_000000")
+        self._write_meta(tmp_path, "USDJPY", "H1", "20240301_000000")
+        self._write_meta(tmp_path, "EUR_USD", "M5", "20240101_000000")
+
+        assert len(list_models(settings)) == 4
+
+        latest = list_models(settings, timeframe="M5", latest_per_symbol=True)
+        assert [m["symbol"] for m in latest] == ["USDJPY", "EUR_USD"]
+        assert latest[0]["path"].endswith("USDJPY_M5_20240201_000000")
+
+
+class TestPredictorLatest:
+    def test_predict_latest_matches_full_predict(self):
+        import lightgbm as lgb
+
+        rng = np.random.default_rng(0)
+        X = pd.DataFrame(rng.normal(size=(300, 4)), columns=["a", "b", "c", "d"])
+        y = X["a"] * 0.5 - X["c"] + rng.normal(scale=0.1, size=300)
+        model = lgb.train(
+            {"objective": "regression", "verbose": -1},
+            lgb.Dataset(X[["c", "a"]], label=y), num_boost_round=20,
+        )
+        predictor = Predictor(model, ["c", "a"])
+
+        for fm in (X, X.iloc[:200], X[["d", "a", "b", "c"]]):
+            expected = float(predictor.predict(fm).iloc[-1])
+            assert predictor.predict_latest(fm) == pytest.approx(expected)
+
+        # 直接生成した Predictor でも売買判定用の推論がモードに従って動く
+        pred_val, _ = predictor.predict_latest_for_trade(X, min_threshold=0.001)
+        assert pred_val == pytest.approx(float(predictor.predict(X).iloc[-1]))
+
+    def test_from_meta_selects_subclass(self):
+        from fxbot.model.predictor import ClassificationPredictor, RegressionPredictor
+
+        meta = {"feature_names": ["a"], "metrics": {"mode": "classification"}}
+        assert isinstance(Predictor.from_meta(None, meta), ClassificationPredictor)
+        assert isinstance(Predictor.from_meta(None, {"feature_names": ["a"]}), RegressionPredictor)
+
+
+class TestTripleBarrier:
+    def test_labels_first_barrier_hit(self):
+        from fxbot.model.labeling import compute_triple_barrier_labels
+
+        rng = np.random.default_rng(1)
+        close = 100 * np.exp(np.cumsum(rng.normal(scale=0.001, size=400)))
+        df = pd.DataFrame({"close": close})
+        horizon, sl_mult, tp_mult = 6, 2.0, 3.0
+        labels = compute_triple_barrier_labels(df, horizon, sl_mult, tp_mult, vol_lookback=20)
+
+        vol = np.concatenate([[np.nan], pd.Series(np.diff(np.log(close))).rolling(20).std()])
+        for i in range(len(close) - 1):
+            if np.isnan(vol[i]):
+                assert pd.isna(labels.iloc[i])
+                continue
+            expected = 0
+            for j in range(i + 1, min(i + horizon + 1, len(close))):
+                if close[j] >= close[i] * np.exp(vol[i] * tp_mult):
+                    expected = 1
+                    break
+                if close[j] <= close[i] * np.exp(-vol[i] * sl_mult):
+                    expected = -1
+                    break
+            assert labels.iloc[i] == expected
+        assert pd.isna(labels.iloc[-1])
+        assert labels.dtype == "Int8"
+
+
+class TestShapImportance:
+    def test_chunked_mean_abs_matches_full(self):
+        import lightgbm as lgb
+
+        from fxbot.model.shap_analysis import (
+            compute_feature_importance,
+            compute_mean_abs_shap,
+            compute_shap_values,
+        )
+
+        rng = np.random.default_rng(2)
+        X = pd.DataFrame(rng.normal(size=(600, 4)), columns=["a", "b", "c", "d"])
+        y = rng.integers(0, 3, size=600)
+        model = lgb.train(
+            {"objective": "multiclass", "num_class": 3, "verbose": -1},
+            lgb.Dataset(X, label=y), num_boost_round=10,
+        )
+        shap_values, _ = compute_shap_values(model, X)
+        expected = compute_feature_importance(shap_values, list(X.columns))
+        result = compute_mean_abs_shap(model, X, chunk=128)
+        pd.testing.assert_frame_equal(result, expected)
@@ -34,6 +34,29 @@ class TestPositionSizer:
         lot_large = calculate_lot(0.003, 1_000_000, 0.001, 0.0001, settings)
         assert lot_large >= lot_small
 
+    def test_zero_atr_returns_min_lot(self, settings):
+        lot = calculate_lot(0.001, 1_000_000, 0.0, 0.0001, settings)
+        assert lot == settings.trading.min_lot
+
+    def test_kelly_path(self, settings):
+        lot = calculate_lot(
+            prediction=0.001,
+            balance=1_000_000,
+            atr=0.001,
+            point=0.0001,
+            settings=settings,
+            win_prob=0.6,
+        )
+        assert settings.trading.min_lot <= lot <= settings.trading.max_lot
+        # エッジなし（勝率0）は取引しない
+        assert calculate_lot(0.001, 1_000_000, 0.001, 0.0001, settings, win_prob=0.0) == 0.0
+        # NaN は従来計算にフォールバック、範囲外は拒否
+        atr_lot = calculate_lot(0.001, 1_000_000, 0.001, 0.0001, settings)
+        nan_lot = calculate_lot(0.001, 1_000_000, 0.001, 0.0001, settings, win_prob=float("nan"))
+        assert nan_lot == atr_lot
+        with pytest.raises(ValueError):
+            calculate_lot(0.001, 1_000_000, 0.001, 0.0001, settings, win_prob=1.5)
+
 
 class TestStopManager:
     def test_buy_stops(self, settings):